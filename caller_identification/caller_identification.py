@@ -0,0 +1,362 @@
+import functools
+import inspect
+import itertools
+import logging
+import os
+import sys
+import threading
+from types import FunctionType
+
+# Returned by caller_instance() for callers that are not methods
+NO_INSTANCE = object()
+
+
+def member_functions(cls, member):
+    """Returns the functions making up a member of cls, looking through descriptors
+    and decorators. Functions only reached through the func of descriptors like
+    functools.cached_property, the registry of functools.singledispatchmethod or
+    the closure of a decorator without __wrapped__ only count if their qualified
+    name places them in the class body."""
+    prefix = f"{cls.__qualname__}."
+    functions = []
+    pending = [(member, True)]
+    seen = set()
+    while pending:
+        member, direct = pending.pop()
+        # Nested classes have bodies of their own
+        if member is None or isinstance(member, type) or id(member) in seen:
+            continue
+        seen.add(id(member))
+        if isinstance(member, (staticmethod, classmethod)):
+            pending.append((member.__func__, direct))
+        elif isinstance(member, property):
+            pending.extend((function, direct) for function in (member.fget, member.fset, member.fdel))
+        elif hasattr(member, "__wrapped__"):  # Look through decorators
+            pending.append((member.__wrapped__, direct))
+        elif isinstance(member, FunctionType):
+            if direct or member.__qualname__.startswith(prefix):
+                functions.append(member)
+            pending.extend(
+                (contents, False)
+                for contents in map(_cell_contents, member.__closure__ or ())
+                if isinstance(contents, FunctionType)
+            )
+        elif isinstance(
+            member, (functools.partial, functools.partialmethod, functools.cached_property)
+        ):
+            pending.append((member.func, False))
+        elif isinstance(member, functools.singledispatchmethod):
+            pending.extend((function, False) for function in member.dispatcher.registry.values())
+    return functions
+
+
+def _cell_contents(cell):
+    try:
+        return cell.cell_contents
+    except ValueError:  # Not set yet
+        return None
+
+
+def class_code_objects(cls):
+    """Returns the code objects of everything defined in the body of a class,
+    including nested functions, lambdas and comprehensions."""
+    pending = [
+        function.__code__
+        for member in vars(cls).values()
+        for function in member_functions(cls, member)
+    ]
+    code_objects = set()
+    while pending:
+        code = pending.pop()
+        if code not in code_objects:
+            code_objects.add(code)
+            pending.extend(const for const in code.co_consts if hasattr(const, "co_code"))
+    return code_objects
+
+
+def subclasses(cls):
+    """Returns the class itself and all of its (indirect) subclasses."""
+    classes = [cls]
+    for subclass in classes:
+        classes.extend(
+            candidate
+            for candidate in type.__subclasses__(subclass)
+            if candidate not in classes
+        )
+    return classes
+
+
+def is_defined_in(code, classes):
+    return any(code in class_code_objects(cls) for cls in classes)
+
+
+def caller_instance(frame):
+    """Returns the self of the method running in frame, or NO_INSTANCE. Reading it
+    materializes the frame's locals, so it is only a fallback for callers their code
+    object did not allow, like methods wrapped beyond recognition."""
+    code = frame.f_code
+    if not code.co_argcount or code.co_varnames[0] != "self":
+        return NO_INSTANCE
+    return frame.f_locals.get("self", NO_INSTANCE)
+
+
+def signature(func):
+    """Returns the parameters of func, with placeholder defaults, and the arguments
+    that forward them unchanged, for generating functions that check their caller
+    before calling func."""
+    code = func.__code__
+    names = code.co_varnames
+    positional = names[: code.co_argcount]
+    keyword_only = names[code.co_argcount : code.co_argcount + code.co_kwonlyargcount]
+    index = code.co_argcount + code.co_kwonlyargcount
+    var_positional = var_keyword = None
+    if code.co_flags & inspect.CO_VARARGS:
+        var_positional = names[index]
+        index += 1
+    if code.co_flags & inspect.CO_VARKEYWORDS:
+        var_keyword = names[index]
+
+    # Defaults are placeholders here, the real ones are copied over afterwards
+    first_default = len(positional) - len(func.__defaults__ or ())
+    parameters = [
+        f"{name}=None" if i >= first_default else name
+        for i, name in enumerate(positional)
+    ]
+    if code.co_posonlyargcount:
+        parameters.insert(code.co_posonlyargcount, "/")
+    if var_positional:
+        parameters.append(f"*{var_positional}")
+    elif keyword_only:
+        parameters.append("*")
+    parameters.extend(f"{name}=None" for name in keyword_only)
+    if var_keyword:
+        parameters.append(f"**{var_keyword}")
+
+    arguments = list(positional)
+    if var_positional:
+        arguments.append(f"*{var_positional}")
+    arguments.extend(f"{name}={name}" for name in keyword_only)
+    if var_keyword:
+        arguments.append(f"**{var_keyword}")
+    return ", ".join(parameters), ", ".join(arguments)
+
+
+# Configuration shared by encapsulated_attributes and encapsulated_methods
+
+ENFORCED = "enforced"
+PRODUCTION = "production"  # No checks, encapsulated members become plain ones
+AUDIT = "audit"  # Check a sample of accesses and report violations instead of raising
+MODES = (ENFORCED, PRODUCTION, AUDIT)
+
+# Maximum number of access decisions remembered per member
+DECISION_CACHE_SIZE = 256
+
+_mode = ENFORCED
+_sample_interval = 100
+_logger = logging.getLogger(__name__)
+
+
+def set_mode(mode):
+    """Sets the encapsulation mode for the attributes and methods encapsulated from now on."""
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown encapsulation mode '{mode}', expected one of {MODES}")
+    _mode = mode
+
+
+def get_mode():
+    return _mode
+
+
+def set_sample_interval(interval):
+    """Sets how many accesses of each member go by per check in audit mode, for
+    the attributes and methods encapsulated from now on."""
+    global _sample_interval
+    if interval < 1:
+        raise ValueError("The sample interval must be at least 1")
+    _sample_interval = interval
+
+
+def get_sample_interval():
+    return _sample_interval
+
+
+def _log_violation(error, code):
+    _logger.warning(
+        "%s (from '%s' in %s:%d)", error, code.co_name, code.co_filename, code.co_firstlineno
+    )
+
+
+_reporter = _log_violation
+
+
+def set_reporter(reporter):
+    """Sets the function called with the PermissionError and the caller's code object
+    of each violation found in audit mode. None restores logging them as warnings."""
+    global _reporter
+    _reporter = reporter if reporter is not None else _log_violation
+
+
+def report_violation(error, code):
+    _reporter(error, code)
+
+
+set_mode(os.environ.get("ENCAPSULATION_MODE", ENFORCED))
+set_sample_interval(int(os.environ.get("ENCAPSULATION_SAMPLE_INTERVAL", _sample_interval)))
+
+
+class DecisionCache(dict):
+    """Bounded cache of access decisions keyed on the caller's code object. Code
+    objects do not reference the class they are defined in, so remembering a
+    decision never keeps a dynamically created class alive. Threads deciding the
+    same caller at once reach the same decision, so it needs no lock."""
+
+    def __init__(self, decide, maxsize=DECISION_CACHE_SIZE):
+        super().__init__()
+        self.decide = decide
+        self.maxsize = maxsize
+        self.trusted = {}  # Decisions made elsewhere, kept when the cache is cleared
+
+    def __missing__(self, code):
+        if len(self) >= self.maxsize + len(self.trusted):
+            # Start over rather than tracking recency, the working set of call
+            # sites using a single member is usually tiny
+            self.clear()
+        decision = self[code] = self.decide(code)
+        return decision
+
+    def trust(self, code, decision):
+        """Remembers a decision for good, e.g. one a static check proved."""
+        self.trusted[code] = decision
+        self[code] = decision
+
+    def clear(self):
+        super().clear()
+        self.update(self.trusted)
+
+
+# Without a GIL, threads sharing a counter would contend on it at every access
+_FREE_THREADED = not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+class _ThreadCount(threading.local):
+    """Counts separately in every thread."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __next__(self):
+        count = self.count
+        self.count = count + 1
+        return count
+
+
+def counter():
+    """Returns the counter of the accesses of a member sampled in audit mode."""
+    if _FREE_THREADED:
+        return _ThreadCount()
+    # next() on itertools.count is a single C call, which keeps the unsampled
+    # accesses cheap and never loses a count to a thread switch
+    return itertools.count()
+
+
+class Storage:
+    """Reads and writes the values of an attribute directly, as handed out by trusted()."""
+
+    __slots__ = ("get", "set")
+
+    def __init__(self, load, store):
+        self.get = load  # get(instance)
+        self.set = store  # set(instance, value)
+
+
+def _plain_storage(name):
+    def load(instance):
+        return getattr(instance, name)
+
+    def store(instance, value):
+        setattr(instance, name, value)
+
+    return Storage(load, store)
+
+
+class _TrustedMembers:
+    """The members trusted() hands out, as attributes named like them in the class
+    body. Members encapsulated with a _grant(code) method, which returns direct
+    access to them for callers that may use them and None otherwise, are looked up
+    when the block starts. The others are not encapsulated, e.g. in production mode,
+    and are handed out as plain attribute access on first use."""
+
+    def __init__(self, classes, code):
+        self.__classes = classes
+        self.__code = code
+        self.__closed = False
+        seen = set()
+        for cls in classes:
+            for klass in cls.__mro__:
+                for name, member in vars(klass).items():
+                    function = getattr(member, "__func__", member)
+                    if name in seen or not hasattr(function, "_grant"):
+                        continue
+                    seen.add(name)
+                    granted = function._grant(code)
+                    if granted is None:
+                        continue  # Left to __getattr__ to refuse
+                    if function is not member:  # Wrapped in staticmethod or classmethod
+                        granted = type(member)(granted).__get__(None, cls)
+                    setattr(self, name, granted)
+
+    def __getattr__(self, name):
+        if self.__closed:
+            raise RuntimeError(f"'{name}' was used after the end of its trusted() block")
+        for cls in self.__classes:
+            member = inspect.getattr_static(cls, name, None)
+            if hasattr(getattr(member, "__func__", member), "_grant"):
+                raise PermissionError(
+                    f"'{name}' of {cls.__qualname__} cannot be used from '{self.__code.co_name}'"
+                )
+        for cls in self.__classes:
+            member = inspect.getattr_static(cls, name, None)
+            if callable(getattr(member, "__func__", member)):
+                granted = getattr(cls, name)
+                break
+        else:
+            granted = _plain_storage(name)
+        setattr(self, name, granted)
+        return granted
+
+    def _close(self):
+        vars(self).clear()
+        self.__closed = True
+
+
+class _TrustedScope:
+    def __init__(self, classes, code):
+        self.classes = classes
+        self.code = code
+
+    def __enter__(self):
+        self.members = _TrustedMembers(self.classes, self.code)
+        return self.members
+
+    def __exit__(self, *exc_info):
+        self.members._close()
+
+
+def trusted(*classes):
+    """Checks the caller once against the encapsulated members of the given classes,
+    and hands out direct access to those it may use for the with block, which then
+    skips checking each access:
+
+        with trusted(Point) as point:
+            for p in points:
+                point._x.set(p, point._x.get(p) + 1)
+                point._move(p, 0, 1)
+
+    Attributes come as a Storage of the instance __dict__ or slot, and methods as
+    their function, bound for class methods. Only the code calling trusted() is
+    checked, so the handles must not be passed on. They are plain objects, so they
+    stay with the block that got them whichever thread or asyncio task runs it."""
+    if not classes:
+        raise TypeError("trusted() expects at least one class")
+    return _TrustedScope(classes, sys._getframe(1).f_code)
@@ -1,6 +1,60 @@
+import inspect
+import os
+import sys
 from time import perf_counter
 from tabulate import tabulate
-from encapsulated_attributes import ProtectedAttribute, PrivateAttribute
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_attributes import (  # noqa: E402
+    AUDIT,
+    ENFORCED,
+    PRODUCTION,
+    PrivateAttribute,
+    ProtectedAttribute,
+    set_mode,
+    set_reporter,
+)
+
+
+# The previous caller check, which materializes the caller's f_locals on every access
+class FrameLocalsProtectedAttribute(ProtectedAttribute):
+    def __get__(self, instance, owner=None):
+        frame = inspect.currentframe().f_back
+        if "self" in frame.f_locals:
+            if isinstance(frame.f_locals["self"], self.defining_class):
+                return instance.__dict__[self.name]
+        raise PermissionError
+
+    def __set__(self, instance, value):
+        frame = inspect.currentframe().f_back
+        if "self" in frame.f_locals:
+            if isinstance(frame.f_locals["self"], self.defining_class):
+                instance.__dict__[self.name] = value
+                return
+        raise PermissionError
+
+
+class FrameLocalsPrivateAttribute(PrivateAttribute):
+    def __get__(self, instance, owner=None):
+        frame = inspect.currentframe().f_back
+        if "self" in frame.f_locals:
+            if type(frame.f_locals["self"]) == self.defining_class:
+                return instance.__dict__[self.name]
+        raise PermissionError
+
+    def __set__(self, instance, value):
+        frame = inspect.currentframe().f_back
+        if "self" in frame.f_locals:
+            if type(frame.f_locals["self"]) == self.defining_class:
+                instance.__dict__[self.name] = value
+                return
+            elif (
+                isinstance(frame.f_locals["self"], self.defining_class)
+                and frame.f_code.co_name == "__init__"
+            ):
+                return
+        raise PermissionError
 
 
 class RegularClass:
@@ -46,50 +100,52 @@ class RegularSubclass(RegularClass):
             pass
 
 
-class DescriptorClass:
-    _protected_attr = ProtectedAttribute()
-    __private_attr = PrivateAttribute()
+def create_descriptor_classes(protected_attribute, private_attribute):
+    class DescriptorClass:
+        _protected_attr = protected_attribute()
+        __private_attr = private_attribute()
 
-    def __init__(self):
-        self._protected_attr = "Protected"
-        self.__private_attr = "Private"
+        def __init__(self):
+            self._protected_attr = "Protected"
+            self.__private_attr = "Private"
 
-    def get_protected_attribute(self):
-        return self._protected_attr
+        def get_protected_attribute(self):
+            return self._protected_attr
 
-    def set_protected_attribute(self, value):
-        self._protected_attr = value
+        def set_protected_attribute(self, value):
+            self._protected_attr = value
 
-    def get_private_attribute(self):
-        return self.__private_attr
+        def get_private_attribute(self):
+            return self.__private_attr
 
-    def set_private_attribute(self, value):
-        self.__private_attr = value
+        def set_private_attribute(self, value):
+            self.__private_attr = value
 
+    class DescriptorSubclass(DescriptorClass):
+        def __init__(self):
+            super().__init__()
 
-class DescriptorSubclass(DescriptorClass):
-    def __init__(self):
-        super().__init__()
+        def get_protected_attribute(self):
+            return self._protected_attr
 
-    def get_protected_attribute(self):
-        return self._protected_attr
+        def set_protected_attribute(self, value):
+            self._protected_attr = value
 
-    def set_protected_attribute(self, value):
-        self._protected_attr = value
+        def get_private_attribute(self):
+            # This will raise a PermissionError
+            try:
+                return self._DescriptorClass__private_attr
+            except PermissionError:
+                pass
 
-    def get_private_attribute(self):
-        # This will raise a PermissionError
-        try:
-            return self._DescriptorClass__private_attr
-        except PermissionError:
-            pass
+        def set_private_attribute(self, value):
+            # This will raise a PermissionError
+            try:
+                self._DescriptorClass__private_attr = value
+            except PermissionError:
+                pass
 
-    def set_private_attribute(self, value):
-        # This will raise a PermissionError
-        try:
-            self._DescriptorClass__private_attr = value
-        except PermissionError:
-            pass
+    return DescriptorClass, DescriptorSubclass
 
 
 def benchmark(func, iterations):
@@ -100,68 +156,60 @@ def benchmark(func, iterations):
     return end_time - start_time
 
 
+def create_classes_in_mode(mode):
+    set_mode(mode)
+    try:
+        return create_descriptor_classes(ProtectedAttribute, PrivateAttribute)
+    finally:
+        set_mode(ENFORCED)
+
+
 def main():
     iterations = 1_000_000
     runs = 5
 
-    regular_class = RegularClass()
-    regular_subclass = RegularSubclass()
-    descriptor_class = DescriptorClass()
-    descriptor_subclass = DescriptorSubclass()
-
-    benchmarks = {
-        "Get protected": (
-            lambda: regular_class.get_protected_attribute(),
-            lambda: descriptor_class.get_protected_attribute(),
-        ),
-        "Set protected": (
-            lambda: regular_class.set_protected_attribute("New Protected"),
-            lambda: descriptor_class.set_protected_attribute("New Protected"),
-        ),
-        "Get private": (
-            lambda: regular_class.get_private_attribute(),
-            lambda: descriptor_class.get_private_attribute(),
-        ),
-        "Set private": (
-            lambda: regular_class.set_private_attribute("New Private"),
-            lambda: descriptor_class.set_private_attribute("New Private"),
-        ),
-        "Get parent protected": (
-            lambda: regular_subclass.get_protected_attribute(),
-            lambda: descriptor_subclass.get_protected_attribute(),
-        ),
-        "Set parent protected": (
-            lambda: regular_subclass.set_protected_attribute("New Protected"),
-            lambda: descriptor_subclass.set_protected_attribute("New Protected"),
-        ),
-        "Get parent private": (
-            lambda: regular_subclass.get_private_attribute(),
-            lambda: descriptor_subclass.get_private_attribute(),
-        ),
-        "Set parent private": (
-            lambda: regular_subclass.set_private_attribute("New Private"),
-            lambda: descriptor_subclass.set_private_attribute("New Private"),
+    implementations = {
+        "Regular": lambda: (RegularClass, RegularSubclass),
+        "Frame locals": lambda: create_descriptor_classes(
+            FrameLocalsProtectedAttribute, FrameLocalsPrivateAttribute
         ),
+        "Enforced": lambda: create_classes_in_mode(ENFORCED),
+        "Production": lambda: create_classes_in_mode(PRODUCTION),
+        "Audit": lambda: create_classes_in_mode(AUDIT),
+    }
+    set_reporter(lambda error, code: None)  # Only measure the cost of sampling
+    operations = {
+        "Get protected": lambda obj, _: obj.get_protected_attribute(),
+        "Set protected": lambda obj, _: obj.set_protected_attribute("New Protected"),
+        "Get private": lambda obj, _: obj.get_private_attribute(),
+        "Set private": lambda obj, _: obj.set_private_attribute("New Private"),
+        "Get parent protected": lambda _, sub: sub.get_protected_attribute(),
+        "Set parent protected": lambda _, sub: sub.set_protected_attribute("New Protected"),
+        "Get parent private": lambda _, sub: sub.get_private_attribute(),
+        "Set parent private": lambda _, sub: sub.set_private_attribute("New Private"),
     }
 
-    results = {name: {"Regular": [], "Descriptor": []} for name in benchmarks}
+    results = {name: {column: [] for column in implementations} for name in operations}
 
-    for _ in range(runs):
-        for name, (regular_func, descriptor_func) in benchmarks.items():
-            results[name]["Regular"].append(benchmark(regular_func, iterations))
-            results[name]["Descriptor"].append(benchmark(descriptor_func, iterations))
+    for column, create_classes in implementations.items():
+        cls, subclass = create_classes()
+        for _ in range(runs):
+            obj, sub = cls(), subclass()
+            for name, operation in operations.items():
+                results[name][column].append(
+                    benchmark(lambda: operation(obj, sub), iterations)
+                )
 
     table = []
     for name, times in results.items():
-        avg_regular = sum(times["Regular"]) / runs
-        avg_descriptor = sum(times["Descriptor"]) / runs
-        ratio = avg_descriptor / avg_regular
+        averages = {column: sum(times[column]) / runs for column in implementations}
         table.append(
-            [
-                name,
-                f"{avg_regular:.6f}",
-                f"{avg_descriptor:.6f}",
-                f"{ratio:.2f}",
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{average / averages['Regular']:.2f}"
+                for column, average in averages.items()
+                if column != "Regular"
             ]
         )
 
@@ -169,12 +217,9 @@ def main():
     print(
         tabulate(
             table,
-            headers=[
-                "Attribute operation",
-                "Regular (s)",
-                "Descriptor (s)",
-                "Descriptor ÷ Regular",
-            ],
+            headers=["Attribute operation"]
+            + [f"{column} (s)" for column in implementations]
+            + [f"{column} ÷ Regular" for column in implementations if column != "Regular"],
         )
     )
 
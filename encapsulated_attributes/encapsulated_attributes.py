@@ -1,64 +1,330 @@
-import inspect
+import operator
+import sys
+from types import MemberDescriptorType
+# The configuration is shared with encapsulated_methods, and set through either module
+from caller_identification import (  # noqa: F401
+    AUDIT,
+    DECISION_CACHE_SIZE,
+    ENFORCED,
+    MODES,
+    PRODUCTION,
+    DecisionCache,
+    Storage,
+    caller_instance,
+    counter,
+    get_mode,
+    get_sample_interval,
+    is_defined_in,
+    report_violation,
+    set_mode,
+    set_reporter,
+    set_sample_interval,
+    subclasses,
+    trusted,
+)
+
+ALLOWED = "allowed"
+IGNORED = "ignored"  # A subclass's __init__ setting a private attribute
+DENIED = "denied"
+
+
+def _storage(attribute):
+    """Returns a Storage reading and writing the values of an attribute where they
+    live, without going through the attribute."""
+    if attribute.slot is not None:
+        slot = vars(attribute.defining_class)[attribute.slot]
+        return Storage(slot.__get__, slot.__set__)
+    name = attribute.name
+
+    def load(instance):
+        return instance.__dict__[name]
+
+    def store(instance, value):
+        instance.__dict__[name] = value
+
+    return Storage(load, store)
+
+
+def slots(*names):
+    """Returns the __slots__ entries that store the encapsulated attributes with
+    the given names, so that their instances need no __dict__, e.g.
+    __slots__ = slots("_protected", "__private")."""
+    return tuple(f"{name}_value" for name in names)
+
+
+def _slot(owner, name):
+    """Returns the name of the slot declared for an attribute, if any."""
+    # Names starting with two underscores are mangled in __slots__ as well
+    slot = f"{name}_value"
+    return slot if isinstance(vars(owner).get(slot), MemberDescriptorType) else None
 
 
 class ProtectedAttribute:
     def __set_name__(self, owner, name):
+        slot = _slot(owner, name)
+        if get_mode() == PRODUCTION:
+            # Values already live in the instance __dict__ or slot under the same name
+            delattr(owner, name)
+            if slot is not None:
+                setattr(owner, name, vars(owner)[slot])
+            return
         self.name = name
         self.defining_class = owner
+        self.decisions = DecisionCache(self._decide)
+        self.slot = slot
+        if get_mode() == AUDIT:
+            _start_sampling(self)
+        elif slot is not None:
+            _start_slot_storage(self)
 
     def __get__(self, instance, owner=None):
-        frame = inspect.currentframe().f_back  # Get the frame info of the caller
-        if "self" in frame.f_locals:
-            # Check if 'self' is an instance of the defining class
-            if isinstance(frame.f_locals["self"], self.defining_class):
-                return instance.__dict__[self.name]
-
-        raise PermissionError(
-            f"Protected attribute '{self.name}' cannot be accessed outside its defining class or subclasses"
-        )
+        # Identify the caller by its code object, without materializing its locals
+        if self.decisions[sys._getframe(1).f_code] is ALLOWED:
+            return instance.__dict__[self.name]
+        if self._decide_instance(sys._getframe(1)) is ALLOWED:
+            return instance.__dict__[self.name]
+
+        raise self._error("accessed")
 
     def __set__(self, instance, value):
-        frame = inspect.currentframe().f_back  # Get the frame info of the caller
-        if "self" in frame.f_locals:
-            # Check if 'self' is an instance of the defining class
-            if isinstance(frame.f_locals["self"], self.defining_class):
-                instance.__dict__[self.name] = value
-                return
-
-        raise PermissionError(
-            f"Protected attribute '{self.name}' cannot be set outside its defining class or subclasses"
+        # Identify the caller by its code object, without materializing its locals
+        if self.decisions[sys._getframe(1).f_code] is ALLOWED:
+            instance.__dict__[self.name] = value
+            return
+        if self._decide_instance(sys._getframe(1)) is ALLOWED:
+            instance.__dict__[self.name] = value
+            return
+
+        raise self._error("set")
+
+    def trust(self, code):
+        """Allows a caller without resolving it, e.g. once a static check proved it
+        safe. The caller is still looked up at each access, the decision is only
+        made ahead of time and kept when the decision cache is cleared."""
+        self.decisions.trust(code, ALLOWED)
+
+    def _grant(self, code):
+        # Direct access to the values for trusted(), if the caller may use them
+        if self.decisions[code] is ALLOWED:
+            return _storage(self)
+        return None
+
+    def _decide(self, code):
+        # Check if the caller is defined in the defining class or its subclasses
+        if is_defined_in(code, subclasses(self.defining_class)):
+            return ALLOWED
+        return DENIED
+
+    def _decide_instance(self, frame):
+        # Never cached, since it depends on the instance the caller runs on
+        if isinstance(caller_instance(frame), self.defining_class):
+            return ALLOWED
+        return DENIED
+
+    def _error(self, action):
+        return PermissionError(
+            f"Protected attribute '{self.name}' cannot be {action} outside its defining class or subclasses"
         )
 
 
 class PrivateAttribute:
     def __set_name__(self, owner, name):
+        slot = _slot(owner, name)
+        if get_mode() == PRODUCTION:
+            # Values already live in the instance __dict__ or slot under the same name
+            delattr(owner, name)
+            if slot is not None:
+                setattr(owner, name, vars(owner)[slot])
+            return
         self.name = name
         self.defining_class = owner
-        
+        self.decisions = DecisionCache(self._decide)
+        self.slot = slot
+        if get_mode() == AUDIT:
+            _start_sampling(self)
+        elif slot is not None:
+            _start_slot_storage(self)
+
     def __get__(self, instance, owner=None):
-        frame = inspect.currentframe().f_back  # Get the frame info of the caller
-        if "self" in frame.f_locals:
-            # Check if 'self' is an instance of the defining class
-            if type(frame.f_locals["self"]) == self.defining_class:
-                return instance.__dict__[self.name]
-
-        raise PermissionError(
-            f"Private attribute '{self.name}' cannot be accessed outside its defining class"
-        )
+        # Identify the caller by its code object, without materializing its locals
+        if self.decisions[sys._getframe(1).f_code] is ALLOWED:
+            return instance.__dict__[self.name]
+        if self._decide_instance(sys._getframe(1)) is ALLOWED:
+            return instance.__dict__[self.name]
+
+        raise self._error("accessed")
 
     def __set__(self, instance, value):
-        frame = inspect.currentframe().f_back  # Get the frame info of the caller
-        if "self" in frame.f_locals:
-            # Check if 'self' is an instance of the defining class
-            if type(frame.f_locals["self"]) == self.defining_class:
-                instance.__dict__[self.name] = value
-                return
-            elif (
-                isinstance(frame.f_locals["self"], self.defining_class)
-                and frame.f_code.co_name == "__init__"
-            ):
-                return  # Do nothing if called from __init__ of a subclass
-
-        raise PermissionError(
-            f"Private attribute '{self.name}' cannot be set outside its defining class"
+        # Identify the caller by its code object, without materializing its locals
+        decision = self.decisions[sys._getframe(1).f_code]
+        if decision is DENIED:
+            decision = self._decide_instance(sys._getframe(1))
+        if decision is ALLOWED:
+            instance.__dict__[self.name] = value
+            return
+        elif decision is IGNORED:
+            return  # Do nothing if called from __init__ of a subclass
+
+        raise self._error("set")
+
+    def trust(self, code):
+        """Allows a caller without resolving it, e.g. once a static check proved it
+        safe. The caller is still looked up at each access, the decision is only
+        made ahead of time and kept when the decision cache is cleared."""
+        self.decisions.trust(code, ALLOWED)
+
+    def _grant(self, code):
+        # Direct access to the values for trusted(), if the caller may use them
+        if self.decisions[code] is ALLOWED:
+            return _storage(self)
+        return None
+
+    def _decide(self, code):
+        # Check if the caller is defined in the defining class itself
+        if is_defined_in(code, [self.defining_class]):
+            return ALLOWED
+        elif code.co_name == "__init__" and is_defined_in(
+            code, subclasses(self.defining_class)
+        ):
+            return IGNORED
+        return DENIED
+
+    def _decide_instance(self, frame):
+        # Never cached, since it depends on the instance the caller runs on
+        instance = caller_instance(frame)
+        if type(instance) is self.defining_class:
+            return ALLOWED
+        elif frame.f_code.co_name == "__init__" and isinstance(instance, self.defining_class):
+            return IGNORED
+        return DENIED
+
+    def _error(self, action):
+        return PermissionError(
+            f"Private attribute '{self.name}' cannot be {action} outside its defining class"
         )
+
+
+class _Sampled:
+    """Checks one in every sample_interval accesses and reports violations
+    instead of raising them. Sets from an __init__ are always checked, so that a
+    subclass's __init__ setting a private attribute does nothing, as when enforced."""
+
+    def __get__(self, instance, owner=None):
+        if not next(self.accesses) % self.sample_interval:
+            self._audit(sys._getframe(1), "accessed")
+        return instance.__dict__[self.name]
+
+    def __set__(self, instance, value):
+        frame = sys._getframe(1)
+        if frame.f_code.co_name == "__init__" and self._ignores(frame):
+            return  # Do nothing if called from __init__ of a subclass, as when enforced
+        if not next(self.accesses) % self.sample_interval:
+            self._audit(frame, "set")
+        instance.__dict__[self.name] = value
+
+    def _ignores(self, frame):
+        decision = self.decisions[frame.f_code]
+        if decision is DENIED:
+            decision = self._decide_instance(frame)
+        return decision is IGNORED
+
+    def _audit(self, frame, action):
+        code = frame.f_code
+        if self.decisions[code] is DENIED and self._decide_instance(frame) is DENIED:
+            report_violation(self._error(action), code)
+
+    def _grant(self, code):
+        # Always granted, the violation is reported once for the whole block
+        if self.decisions[code] is DENIED:
+            report_violation(self._error("accessed"), code)
+        return _storage(self)
+
+
+class _SampledProtectedAttribute(_Sampled, ProtectedAttribute):
+    pass
+
+
+class _SampledPrivateAttribute(_Sampled, PrivateAttribute):
+    pass
+
+
+class _SampledSlotted(_Sampled):
+    def __get__(self, instance, owner=None):
+        if not next(self.accesses) % self.sample_interval:
+            self._audit(sys._getframe(1), "accessed")
+        return self.load(instance)
+
+    def __set__(self, instance, value):
+        frame = sys._getframe(1)
+        if frame.f_code.co_name == "__init__" and self._ignores(frame):
+            return  # Do nothing if called from __init__ of a subclass, as when enforced
+        if not next(self.accesses) % self.sample_interval:
+            self._audit(frame, "set")
+        setattr(instance, self.slot, value)
+
+
+class _SampledSlottedProtectedAttribute(_SampledSlotted, ProtectedAttribute):
+    pass
+
+
+class _SampledSlottedPrivateAttribute(_SampledSlotted, PrivateAttribute):
+    pass
+
+
+def _start_sampling(attribute):
+    attribute.accesses = counter()
+    attribute.sample_interval = get_sample_interval()
+    if attribute.slot is not None:
+        attribute.load = operator.attrgetter(attribute.slot)
+    if isinstance(attribute, ProtectedAttribute):
+        if attribute.slot is None:
+            attribute.__class__ = _SampledProtectedAttribute
+        else:
+            attribute.__class__ = _SampledSlottedProtectedAttribute
+    elif attribute.slot is None:
+        attribute.__class__ = _SampledPrivateAttribute
+    else:
+        attribute.__class__ = _SampledSlottedPrivateAttribute
+
+
+class _Slotted:
+    """Stores values in the slot declared with slots() instead of the instance __dict__."""
+
+    def __get__(self, instance, owner=None):
+        # Identify the caller by its code object, without materializing its locals
+        if self.decisions[sys._getframe(1).f_code] is ALLOWED:
+            return self.load(instance)
+        if self._decide_instance(sys._getframe(1)) is ALLOWED:
+            return self.load(instance)
+
+        raise self._error("accessed")
+
+    def __set__(self, instance, value):
+        # Identify the caller by its code object, without materializing its locals
+        decision = self.decisions[sys._getframe(1).f_code]
+        if decision is DENIED:
+            decision = self._decide_instance(sys._getframe(1))
+        if decision is ALLOWED:
+            setattr(instance, self.slot, value)
+            return
+        elif decision is IGNORED:
+            return  # Do nothing if called from __init__ of a subclass
+
+        raise self._error("set")
+
+
+class _SlottedProtectedAttribute(_Slotted, ProtectedAttribute):
+    pass
+
+
+class _SlottedPrivateAttribute(_Slotted, PrivateAttribute):
+    pass
+
+
+def _start_slot_storage(attribute):
+    # attrgetter reads the slot in C, without creating a method wrapper per access
+    attribute.load = operator.attrgetter(attribute.slot)
+    if isinstance(attribute, ProtectedAttribute):
+        attribute.__class__ = _SlottedProtectedAttribute
+    else:
+        attribute.__class__ = _SlottedPrivateAttribute
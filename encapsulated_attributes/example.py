@@ -1,4 +1,9 @@
-from encapsulated_attributes import ProtectedAttribute, PrivateAttribute
+import os
+import sys
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_attributes import ProtectedAttribute, PrivateAttribute  # noqa: E402
 
 
 class DescriptorClass:
@@ -0,0 +1,148 @@
+import os
+import sys
+from time import perf_counter
+from tabulate import tabulate
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_attributes import (  # noqa: E402
+    PrivateAttribute,
+    ProtectedAttribute,
+    trusted,
+)
+
+
+class RegularClass:
+    def __init__(self):
+        self._protected_attr = 1
+        self.__private_attr = 1
+
+    def sum_protected(self, iterations):
+        total = 0
+        for _ in range(iterations):
+            total += self._protected_attr
+        return total
+
+    def sum_private(self, iterations):
+        total = 0
+        for _ in range(iterations):
+            total += self.__private_attr
+        return total
+
+    def set_protected(self, iterations):
+        for i in range(iterations):
+            self._protected_attr = i
+
+
+class DescriptorClass:
+    _protected_attr = ProtectedAttribute()
+    __private_attr = PrivateAttribute()
+
+    def __init__(self):
+        self._protected_attr = 1
+        self.__private_attr = 1
+
+    def sum_protected(self, iterations):
+        total = 0
+        for _ in range(iterations):
+            total += self._protected_attr
+        return total
+
+    def sum_private(self, iterations):
+        total = 0
+        for _ in range(iterations):
+            total += self.__private_attr
+        return total
+
+    def set_protected(self, iterations):
+        for i in range(iterations):
+            self._protected_attr = i
+
+
+class TrustedClass:
+    _protected_attr = ProtectedAttribute()
+    __private_attr = PrivateAttribute()
+
+    def __init__(self):
+        self._protected_attr = 1
+        self.__private_attr = 1
+
+    def sum_protected(self, iterations):
+        total = 0
+        with trusted(TrustedClass) as members:
+            protected_attr = members._protected_attr
+            for _ in range(iterations):
+                total += protected_attr.get(self)
+        return total
+
+    def sum_private(self, iterations):
+        total = 0
+        with trusted(TrustedClass) as members:
+            private_attr = members.__private_attr
+            for _ in range(iterations):
+                total += private_attr.get(self)
+        return total
+
+    def set_protected(self, iterations):
+        with trusted(TrustedClass) as members:
+            protected_attr = members._protected_attr
+            for i in range(iterations):
+                protected_attr.set(self, i)
+
+
+def benchmark(func, iterations):
+    start_time = perf_counter()
+    func(iterations)
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    iterations = 1_000_000
+    runs = 5
+
+    implementations = {
+        "Regular": RegularClass,
+        "Enforced": DescriptorClass,
+        "Trusted scope": TrustedClass,
+    }
+    operations = {
+        "Sum protected": lambda obj: obj.sum_protected,
+        "Sum private": lambda obj: obj.sum_private,
+        "Set protected": lambda obj: obj.set_protected,
+    }
+
+    results = {name: {column: [] for column in implementations} for name in operations}
+
+    for column, cls in implementations.items():
+        for _ in range(runs):
+            obj = cls()
+            for name, operation in operations.items():
+                results[name][column].append(benchmark(operation(obj), iterations))
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in implementations}
+        table.append(
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{average / averages['Regular']:.2f}"
+                for column, average in averages.items()
+                if column != "Regular"
+            ]
+        )
+
+    print(f"Loop results (average of {runs} runs, {iterations:_} iterations per loop):")
+    print(
+        tabulate(
+            table,
+            headers=["Loop"]
+            + [f"{column} (s)" for column in implementations]
+            + [f"{column} ÷ Regular" for column in implementations if column != "Regular"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os
+import sys
+import tracemalloc
+from tabulate import tabulate
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_attributes import (  # noqa: E402
+    ENFORCED,
+    PRODUCTION,
+    PrivateAttribute,
+    ProtectedAttribute,
+    set_mode,
+    slots,
+)
+
+
+class RegularClass:
+    def __init__(self):
+        self._protected_attr = "Protected"
+        self.__private_attr = "Private"
+
+
+class RegularSlotsClass:
+    __slots__ = ("_protected_attr", "__private_attr")
+
+    def __init__(self):
+        self._protected_attr = "Protected"
+        self.__private_attr = "Private"
+
+
+def create_descriptor_class(mode):
+    set_mode(mode)
+    try:
+        class DescriptorClass:
+            _protected_attr = ProtectedAttribute()
+            __private_attr = PrivateAttribute()
+
+            def __init__(self):
+                self._protected_attr = "Protected"
+                self.__private_attr = "Private"
+
+        return DescriptorClass
+    finally:
+        set_mode(ENFORCED)
+
+
+def create_slots_descriptor_class(mode):
+    set_mode(mode)
+    try:
+        class SlotsDescriptorClass:
+            __slots__ = slots("_protected_attr", "__private_attr")
+            _protected_attr = ProtectedAttribute()
+            __private_attr = PrivateAttribute()
+
+            def __init__(self):
+                self._protected_attr = "Protected"
+                self.__private_attr = "Private"
+
+        return SlotsDescriptorClass
+    finally:
+        set_mode(ENFORCED)
+
+
+def measure(cls, count):
+    """Returns the number of bytes allocated per instance of cls."""
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        instances = [cls() for _ in range(count)]
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Leave out the list holding the instances
+    return (end - start - instances.__sizeof__()) / count
+
+
+def main():
+    count = 100_000
+    runs = 5
+
+    implementations = {
+        "Regular": RegularClass,
+        "Regular with slots": RegularSlotsClass,
+        "Enforced": create_descriptor_class(ENFORCED),
+        "Enforced with slots": create_slots_descriptor_class(ENFORCED),
+        "Production": create_descriptor_class(PRODUCTION),
+        "Production with slots": create_slots_descriptor_class(PRODUCTION),
+    }
+
+    results = {name: [] for name in implementations}
+    for _ in range(runs):
+        for name, cls in implementations.items():
+            results[name].append(measure(cls, count))
+
+    table = []
+    averages = {name: sum(sizes) / runs for name, sizes in results.items()}
+    for name, average in averages.items():
+        table.append([name, f"{average:.1f}", f"{average / averages['Regular']:.2f}"])
+
+    print(f"Memory results (average of {runs} runs, {count:_} instances each):")
+    print(
+        tabulate(
+            table,
+            headers=["Storage", "Bytes per instance", "÷ Regular"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
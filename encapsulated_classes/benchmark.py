@@ -0,0 +1,193 @@
+import os
+import sys
+from time import perf_counter
+from tabulate import tabulate
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [
+    os.path.join(PACKAGE_DIRECTORY, "caller_identification"),
+    os.path.join(PACKAGE_DIRECTORY, "encapsulated_attributes"),
+    os.path.join(PACKAGE_DIRECTORY, "encapsulated_methods"),
+]
+from encapsulated_classes import encapsulated  # noqa: E402
+from encapsulated_attributes import PrivateAttribute, ProtectedAttribute  # noqa: E402
+from encapsulated_methods import private, protected  # noqa: E402
+
+
+class RegularClass:
+    def __init__(self):
+        self._protected_attr = "Protected"
+        self.__private_attr = "Private"
+
+    def get_protected_attribute(self):
+        return self._protected_attr
+
+    def set_protected_attribute(self, value):
+        self._protected_attr = value
+
+    def get_private_attribute(self):
+        return self.__private_attr
+
+    def _protected_method(self):
+        pass
+
+    def __private_method(self):
+        pass
+
+    def call_protected_method(self):
+        self._protected_method()
+
+    def call_private_method(self):
+        self.__private_method()
+
+
+class RegularSubclass(RegularClass):
+    def get_parent_protected_attribute(self):
+        return self._protected_attr
+
+    def call_parent_protected_method(self):
+        self._protected_method()
+
+
+class PerMemberClass:
+    _protected_attr = ProtectedAttribute()
+    __private_attr = PrivateAttribute()
+
+    def __init__(self):
+        self._protected_attr = "Protected"
+        self.__private_attr = "Private"
+
+    def get_protected_attribute(self):
+        return self._protected_attr
+
+    def set_protected_attribute(self, value):
+        self._protected_attr = value
+
+    def get_private_attribute(self):
+        return self.__private_attr
+
+    @protected
+    def _protected_method(self):
+        pass
+
+    @private
+    def __private_method(self):
+        pass
+
+    def call_protected_method(self):
+        self._protected_method()
+
+    def call_private_method(self):
+        self.__private_method()
+
+
+class PerMemberSubclass(PerMemberClass):
+    def get_parent_protected_attribute(self):
+        return self._protected_attr
+
+    def call_parent_protected_method(self):
+        self._protected_method()
+
+
+@encapsulated
+class EncapsulatedClass:
+    _protected_attr: str
+    __private_attr: str
+
+    def __init__(self):
+        self._protected_attr = "Protected"
+        self.__private_attr = "Private"
+
+    def get_protected_attribute(self):
+        return self._protected_attr
+
+    def set_protected_attribute(self, value):
+        self._protected_attr = value
+
+    def get_private_attribute(self):
+        return self.__private_attr
+
+    def _protected_method(self):
+        pass
+
+    def __private_method(self):
+        pass
+
+    def call_protected_method(self):
+        self._protected_method()
+
+    def call_private_method(self):
+        self.__private_method()
+
+
+class EncapsulatedSubclass(EncapsulatedClass):
+    def get_parent_protected_attribute(self):
+        return self._protected_attr
+
+    def call_parent_protected_method(self):
+        self._protected_method()
+
+
+def benchmark(func, iterations):
+    start_time = perf_counter()
+    for _ in range(iterations):
+        func()
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    iterations = 1_000_000
+    runs = 5
+
+    implementations = {
+        "Regular": (RegularClass, RegularSubclass),
+        "Per member": (PerMemberClass, PerMemberSubclass),
+        "Encapsulated": (EncapsulatedClass, EncapsulatedSubclass),
+    }
+    operations = {
+        "Get protected": lambda obj, _: obj.get_protected_attribute(),
+        "Set protected": lambda obj, _: obj.set_protected_attribute("New Protected"),
+        "Get private": lambda obj, _: obj.get_private_attribute(),
+        "Get parent protected": lambda _, sub: sub.get_parent_protected_attribute(),
+        "Call protected": lambda obj, _: obj.call_protected_method(),
+        "Call private": lambda obj, _: obj.call_private_method(),
+        "Call parent protected": lambda _, sub: sub.call_parent_protected_method(),
+    }
+
+    results = {name: {column: [] for column in implementations} for name in operations}
+
+    for _ in range(runs):
+        for column, (cls, subclass) in implementations.items():
+            obj, sub = cls(), subclass()
+            for name, operation in operations.items():
+                results[name][column].append(
+                    benchmark(lambda: operation(obj, sub), iterations)
+                )
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in implementations}
+        table.append(
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{average / averages['Regular']:.2f}"
+                for column, average in averages.items()
+                if column != "Regular"
+            ]
+        )
+
+    print(f"Benchmark results (average of {runs} runs, {iterations:_} iterations each):")
+    print(
+        tabulate(
+            table,
+            headers=["Operation"]
+            + [f"{column} (s)" for column in implementations]
+            + [f"{column} ÷ Regular" for column in implementations if column != "Regular"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
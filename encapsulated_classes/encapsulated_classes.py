@@ -0,0 +1,274 @@
+import functools
+import inspect
+import sys
+import typing
+from types import FunctionType, MemberDescriptorType
+from caller_identification import (
+    caller_instance,
+    class_code_objects,
+    is_defined_in,
+    signature,
+    subclasses,
+)
+
+PROTECTED = "protected"
+PRIVATE = "private"
+
+_MISSING = object()
+
+
+def _mangle(cls, name):
+    if name.startswith("__") and not name.endswith("__"):
+        return f"_{cls.__name__.lstrip('_')}{name}"
+    return name
+
+
+def _kind(cls, name):
+    """Returns the encapsulation implied by the naming conventions, if any."""
+    if name.startswith(f"_{cls.__name__.lstrip('_')}__"):
+        return PRIVATE
+    elif name.startswith("_") and not name.endswith("_"):
+        # _sunder_ names are hooks called from elsewhere, like those of enum
+        return PROTECTED
+    return None
+
+
+def _is_class_var(annotation):
+    if isinstance(annotation, str):  # Annotations postponed with from __future__ import annotations
+        return annotation.startswith(("ClassVar", "typing.ClassVar"))
+    return annotation is typing.ClassVar or typing.get_origin(annotation) is typing.ClassVar
+
+
+def _function(member):
+    """Returns the function of a method, looking through staticmethod and classmethod."""
+    if isinstance(member, (staticmethod, classmethod)):
+        return member.__func__
+    return member
+
+
+class _Access:
+    """The callers allowed to use the protected and private members of a class.
+    Code from the class body is known up front, while code from subclasses
+    defined later is looked up once and then remembered."""
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.private = class_code_objects(cls)
+        self.protected = set(self.private)
+
+    def allow_protected(self, code):
+        if is_defined_in(code, subclasses(self.cls)):
+            self.protected.add(code)
+            return True
+        return False
+
+    def ignore_private(self, code):
+        # Setting a private attribute in the __init__ of a subclass does nothing
+        return code.co_name == "__init__" and is_defined_in(code, subclasses(self.cls))
+
+    # Fallbacks for callers no code object allowed, never remembered since they
+    # depend on the instance the caller runs on
+
+    def protected_instance(self, frame):
+        return isinstance(caller_instance(frame), self.cls)
+
+    def private_instance(self, frame):
+        return type(caller_instance(frame)) is self.cls
+
+
+def _attribute_error(kind, name, action):
+    if kind == PROTECTED:
+        return PermissionError(
+            f"Protected attribute '{name}' cannot be {action} outside its defining class or subclasses"
+        )
+    return PermissionError(
+        f"Private attribute '{name}' cannot be {action} outside its defining class"
+    )
+
+
+def _method_error(kind, name):
+    if kind == PROTECTED:
+        return PermissionError(
+            f"Protected function '{name}' cannot be called outside its defining class and subclasses"
+        )
+    return PermissionError(f"Private function '{name}' cannot be called outside its defining class")
+
+
+def _guard(accessor, parameters, kind, error, ignore=False):
+    """Returns the lines checking the caller of an accessor. The last allowed
+    caller is compared by identity first, which skips hashing its code object."""
+    if kind == PROTECTED:
+        # Subclasses defined after the class are found once and then remembered
+        check = "__code in __protected or __allow_protected(__code)"
+    else:
+        check = "__code in __private"
+    lines = [
+        f"    __last_{accessor} = None",
+        f"    def __{accessor}({parameters}):",
+        f"        nonlocal __last_{accessor}",
+        "        __code = __getframe(1).f_code",
+        f"        if __code is not __last_{accessor}:",
+        f"            if {check}:",
+        f"                __last_{accessor} = __code",
+        f"            elif not __{kind}_instance(__getframe(1)):",
+    ]
+    if ignore:
+        lines += [
+            "                if __ignore_private(__code):",
+            "                    return",
+        ]
+    lines.append(f"                raise {error}")
+    return lines
+
+
+def _attribute_source(index, name, kind, storage, has_default):
+    if storage is None:
+        load = f"instance.__dict__[{name!r}]"
+        store = f"instance.__dict__[{name!r}] = value"
+    else:
+        load = f"__load_{index}(instance)"
+        store = f"__store_{index}(instance, value)"
+
+    getter = _guard(
+        f"get_{index}", "instance", kind, f"__attribute_error({kind!r}, {name!r}, 'accessed')"
+    )
+    if has_default:
+        getter += [
+            "        try:",
+            f"            return {load}",
+            "        except KeyError:",
+            f"            return __default_{index}",
+        ]
+    else:
+        getter.append(f"        return {load}")
+
+    setter = _guard(
+        f"set_{index}",
+        "instance, value",
+        kind,
+        f"__attribute_error({kind!r}, {name!r}, 'set')",
+        ignore=kind == PRIVATE,
+    )
+    setter.append(f"        {store}")
+    return getter + setter
+
+
+def _method_source(index, function, kind):
+    parameters, arguments = signature(function)
+    lines = _guard(
+        f"method_{index}", parameters, kind, f"__method_error({kind!r}, {function.__name__!r})"
+    )
+    lines.append(f"        return __function_{index}({arguments})")
+    return lines
+
+
+def _specialize(cls, members):
+    """Replaces the given members of cls with accessors generated for this class
+    alone, which check their caller against the allowed code objects directly."""
+    access = _Access(cls)
+    namespace = {
+        "__protected": access.protected,
+        "__private": access.private,
+        "__allow_protected": access.allow_protected,
+        "__ignore_private": access.ignore_private,
+        "__protected_instance": access.protected_instance,
+        "__private_instance": access.private_instance,
+        "__attribute_error": _attribute_error,
+        "__method_error": _method_error,
+        "__getframe": sys._getframe,
+    }
+    annotations = inspect.get_annotations(cls)
+    lines = []
+    results = {}
+    for index, (name, kind) in enumerate(members.items()):
+        member = vars(cls).get(name, _MISSING)
+        function = _function(member)
+        if isinstance(function, FunctionType):
+            namespace[f"__function_{index}"] = function
+            lines += _method_source(index, function, kind)
+            results[name] = f"__method_{index}"
+            continue
+        if _is_class_var(annotations.get(name)) or (
+            hasattr(type(member), "__get__") and not isinstance(member, MemberDescriptorType)
+        ):
+            raise TypeError(
+                f"Cannot encapsulate '{name}' of {cls.__qualname__}, "
+                "which is neither a method nor an instance attribute"
+            )
+
+        storage = member if isinstance(member, MemberDescriptorType) else None
+        if storage is not None:
+            # The accessor takes over the name of the slot and reads it directly
+            namespace[f"__load_{index}"] = storage.__get__
+            namespace[f"__store_{index}"] = storage.__set__
+        has_default = storage is None and member is not _MISSING
+        if has_default:
+            namespace[f"__default_{index}"] = member
+        lines += _attribute_source(index, name, kind, storage, has_default)
+        results[name] = (f"__get_{index}", f"__set_{index}")
+
+    source = (
+        f"def __create({', '.join(namespace)}):\n"
+        + "".join(f"{line}\n" for line in lines)
+        + "    return {"
+        + ", ".join(
+            f"{name!r}: {result}" if isinstance(result, str) else f"{name!r}: ({', '.join(result)})"
+            for name, result in results.items()
+        )
+        + "}\n"
+    )
+    created = {}
+    exec(source, created)
+    accessors = created["__create"](**namespace)
+
+    for name, accessor in accessors.items():
+        if isinstance(accessor, tuple):
+            getter, setter = accessor
+            for function in accessor:
+                function.__qualname__ = f"{cls.__qualname__}.{name}"
+            setattr(cls, name, property(getter, setter))
+        else:
+            member = vars(cls)[name]
+            function = _function(member)
+            accessor.__defaults__ = function.__defaults__
+            accessor.__kwdefaults__ = function.__kwdefaults__
+            accessor = functools.update_wrapper(accessor, function)
+            if member is not function:  # Wrapped in staticmethod or classmethod again
+                accessor = type(member)(accessor)
+            setattr(cls, name, accessor)
+    return cls
+
+
+def _convention_members(cls):
+    """Returns the methods and instance attributes of cls named like protected or
+    private members. Annotated names given a value in the class body or annotated
+    as ClassVar are class attributes, which are left as they are."""
+    members = vars(cls)
+    names = [name for name, member in members.items() if isinstance(_function(member), FunctionType)]
+    names += [
+        name
+        for name, annotation in inspect.get_annotations(cls).items()
+        if name not in members and not _is_class_var(annotation)
+    ]
+    names += [name for name, member in members.items() if isinstance(member, MemberDescriptorType)]
+    return {name: _kind(cls, name) for name in dict.fromkeys(names) if _kind(cls, name)}
+
+
+def encapsulated(cls=None, *, protected=(), private=()):
+    """Class decorator making the members named like protected (_x) or private
+    (__x) ones encapsulated: methods, including static and class methods, and
+    instance attributes declared by an annotation alone or in __slots__.
+    Alternatively, the protected and private member names are given explicitly,
+    as written in the class body, and annotated ones may then have a default."""
+
+    def decorate(cls):
+        if protected or private:
+            members = {_mangle(cls, name): PROTECTED for name in protected}
+            members.update((_mangle(cls, name), PRIVATE) for name in private)
+        else:
+            members = _convention_members(cls)
+        return _specialize(cls, members)
+
+    if cls is None:
+        return decorate
+    return decorate(cls)
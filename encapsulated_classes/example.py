@@ -0,0 +1,84 @@
+import os
+import sys
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_classes import encapsulated  # noqa: E402
+
+
+@encapsulated
+class Account:
+    _balance: int
+    __pin: str
+
+    def __init__(self, balance, pin):
+        self._balance = balance
+        self.__pin = pin
+
+    def withdraw(self, amount, pin):
+        if self.__check_pin(pin):
+            self._apply(-amount)
+        return self._balance
+
+    def _apply(self, amount):
+        self._balance += amount
+
+    def __check_pin(self, pin):
+        return pin == self.__pin
+
+
+class SavingsAccount(Account):
+    def add_interest(self, rate):
+        self._apply(self._balance * rate)
+        return self._balance
+
+    def get_parent_pin(self):
+        return self._Account__pin
+
+
+@encapsulated(protected=["audit"], private=["__log"])
+class Ledger:
+    def __init__(self):
+        self.__log = []
+
+    def record(self, entry):
+        self.__log.append(entry)
+        return self.audit()
+
+    def audit(self):
+        return len(self.__log)
+
+
+def main():
+    account = Account(100, "1234")
+    print(f"Withdraw within the class: {account.withdraw(30, '1234')}")
+    try:
+        print(f"Get protected attribute outside the class: {account._balance}")
+    except PermissionError:
+        print("Failed to get protected attribute outside the class")
+    try:
+        account._apply(1_000)
+    except PermissionError:
+        print("Failed to call protected method outside the class")
+    try:
+        account._Account__check_pin("0000")
+    except PermissionError:
+        print("Failed to call private method outside the class\n")
+
+    savings = SavingsAccount(200, "5678")
+    print(f"Call parent protected method from the subclass: {savings.add_interest(0.5)}")
+    try:
+        savings.get_parent_pin()
+    except PermissionError:
+        print("Failed to get parent private attribute from the subclass\n")
+
+    ledger = Ledger()
+    print(f"Entries recorded with an explicit spec: {ledger.record('deposit')}")
+    try:
+        ledger.audit()
+    except PermissionError:
+        print("Failed to call protected method named in the spec outside the class")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,48 @@
+import inspect
+import os
+import sys
 from time import perf_counter
 from tabulate import tabulate
-from encapsulated_methods import protected, private
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_methods import (  # noqa: E402
+    AUDIT,
+    ENFORCED,
+    PRODUCTION,
+    private,
+    protected,
+    set_mode,
+    set_reporter,
+)
+
+
+# The previous caller check, which materializes the caller's f_locals and looks up
+# the defining class on every call
+def frame_locals_protected(func):
+    def wrapper(*args, **kwargs):
+        frame = inspect.currentframe().f_back
+        if "self" in frame.f_locals:
+            defining_class_name = func.__qualname__.split(".")[0]
+            defining_class = getattr(inspect.getmodule(func), defining_class_name, None)
+            if defining_class and isinstance(frame.f_locals["self"], defining_class):
+                return func(*args, **kwargs)
+        raise PermissionError
+
+    return wrapper
+
+
+def frame_locals_private(func):
+    def wrapper(*args, **kwargs):
+        frame = inspect.currentframe().f_back
+        if "self" in frame.f_locals:
+            defining_class_name = func.__qualname__.split(".")[0]
+            defining_class = getattr(inspect.getmodule(func), defining_class_name, None)
+            if type(frame.f_locals["self"]) == defining_class:
+                return func(*args, **kwargs)
+        raise PermissionError
+
+    return wrapper
 
 
 class RegularClass:
@@ -19,6 +61,21 @@ class RegularClass:
     def call_private_method(self):
         self.__private_method()
 
+    def _protected_method_with_arguments(self, a, b, c=None, *, d=None):
+        pass
+
+    def call_with_positional_arguments(self):
+        self._protected_method_with_arguments(1, 2, 3)
+
+    def call_with_keyword_arguments(self):
+        self._protected_method_with_arguments(a=1, b=2, c=3, d=4)
+
+    def call_with_default_arguments(self):
+        self._protected_method_with_arguments(1, 2)
+
+    def call_through_class(self):
+        type(self)._protected_method_with_arguments(self, 1, 2, d=4)
+
 
 class RegularSubclass(RegularClass):
     def call_parent_protected_method(self):
@@ -32,12 +89,62 @@ class RegularSubclass(RegularClass):
             pass
 
 
-class DecoratedClass:
-    @protected
+def create_decorated_classes(mode):
+    set_mode(mode)
+    try:
+        class DecoratedClass:
+            @protected
+            def _protected_method(self):
+                pass
+
+            @private
+            def __private_method(self):
+                pass
+
+            def call_protected_method(self):
+                self._protected_method()
+
+            def call_private_method(self):
+                self.__private_method()
+
+            @protected
+            def _protected_method_with_arguments(self, a, b, c=None, *, d=None):
+                pass
+
+            def call_with_positional_arguments(self):
+                self._protected_method_with_arguments(1, 2, 3)
+
+            def call_with_keyword_arguments(self):
+                self._protected_method_with_arguments(a=1, b=2, c=3, d=4)
+
+            def call_with_default_arguments(self):
+                self._protected_method_with_arguments(1, 2)
+
+            def call_through_class(self):
+                type(self)._protected_method_with_arguments(self, 1, 2, d=4)
+
+        class DecoratedSubclass(DecoratedClass):
+            def call_parent_protected_method(self):
+                self._protected_method()
+
+            def call_parent_private_method(self):
+                # This will raise a PermissionError
+                try:
+                    self._DecoratedClass__private_method()
+                except PermissionError:
+                    pass
+
+        return DecoratedClass, DecoratedSubclass
+    finally:
+        set_mode(ENFORCED)
+
+
+class FrameLocalsClass:
+    @frame_locals_protected
     def _protected_method(self):
         pass
 
-    @private
+    @frame_locals_private
     def __private_method(self):
         pass
 
@@ -47,15 +154,31 @@ class DecoratedClass:
     def call_private_method(self):
         self.__private_method()
 
+    @frame_locals_protected
+    def _protected_method_with_arguments(self, a, b, c=None, *, d=None):
+        pass
 
-class DecoratedSubclass(DecoratedClass):
+    def call_with_positional_arguments(self):
+        self._protected_method_with_arguments(1, 2, 3)
+
+    def call_with_keyword_arguments(self):
+        self._protected_method_with_arguments(a=1, b=2, c=3, d=4)
+
+    def call_with_default_arguments(self):
+        self._protected_method_with_arguments(1, 2)
+
+    def call_through_class(self):
+        type(self)._protected_method_with_arguments(self, 1, 2, d=4)
+
+
+class FrameLocalsSubclass(FrameLocalsClass):
     def call_parent_protected_method(self):
         self._protected_method()
 
     def call_parent_private_method(self):
         # This will raise a PermissionError
         try:
-            self._DecoratedClass__private_method()
+            self._FrameLocalsClass__private_method()
         except PermissionError:
             pass
 
@@ -72,48 +195,46 @@ def main():
     iterations = 1_000_000
     runs = 5
 
-    regular_class = RegularClass()
-    regular_subclass = RegularSubclass()
-    decorated_class = DecoratedClass()
-    decorated_subclass = DecoratedSubclass()
-
-    benchmarks = {
-        "Protected": (
-            lambda: regular_class.call_protected_method(),
-            lambda: decorated_class.call_protected_method(),
-        ),
-        "Private": (
-            lambda: regular_class.call_private_method(),
-            lambda: decorated_class.call_private_method(),
-        ),
-        "Parent's protected": (
-            lambda: regular_subclass.call_parent_protected_method(),
-            lambda: decorated_subclass.call_parent_protected_method(),
-        ),
-        "Parent's private": (
-            lambda: regular_subclass.call_parent_private_method(),
-            lambda: decorated_subclass.call_parent_private_method(),
-        ),
+    implementations = {
+        "Regular": lambda: (RegularClass, RegularSubclass),
+        "Frame locals": lambda: (FrameLocalsClass, FrameLocalsSubclass),
+        "Enforced": lambda: create_decorated_classes(ENFORCED),
+        "Production": lambda: create_decorated_classes(PRODUCTION),
+        "Audit": lambda: create_decorated_classes(AUDIT),
+    }
+    set_reporter(lambda error, code: None)  # Only measure the cost of sampling
+    operations = {
+        "Protected": lambda obj, _: obj.call_protected_method(),
+        "Private": lambda obj, _: obj.call_private_method(),
+        "Parent's protected": lambda _, sub: sub.call_parent_protected_method(),
+        "Parent's private": lambda _, sub: sub.call_parent_private_method(),
+        "Positional arguments": lambda obj, _: obj.call_with_positional_arguments(),
+        "Keyword arguments": lambda obj, _: obj.call_with_keyword_arguments(),
+        "Default arguments": lambda obj, _: obj.call_with_default_arguments(),
+        "Through the class": lambda obj, _: obj.call_through_class(),
     }
 
-    results = {name: {"Regular": [], "Decorated": []} for name in benchmarks}
+    results = {name: {column: [] for column in implementations} for name in operations}
 
-    for _ in range(runs):
-        for name, (regular_func, decorated_func) in benchmarks.items():
-            results[name]["Regular"].append(benchmark(regular_func, iterations))
-            results[name]["Decorated"].append(benchmark(decorated_func, iterations))
+    for column, create_classes in implementations.items():
+        cls, subclass = create_classes()
+        for _ in range(runs):
+            obj, sub = cls(), subclass()
+            for name, operation in operations.items():
+                results[name][column].append(
+                    benchmark(lambda: operation(obj, sub), iterations)
+                )
 
     table = []
     for name, times in results.items():
-        avg_regular = sum(times["Regular"]) / runs
-        avg_decorated = sum(times["Decorated"]) / runs
-        ratio = avg_decorated / avg_regular
+        averages = {column: sum(times[column]) / runs for column in implementations}
         table.append(
-            [
-                name,
-                f"{avg_regular:.6f}",
-                f"{avg_decorated:.6f}",
-                f"{ratio:.2f}",
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{average / averages['Regular']:.2f}"
+                for column, average in averages.items()
+                if column != "Regular"
             ]
         )
 
@@ -123,12 +244,9 @@ def main():
     print(
         tabulate(
             table,
-            headers=[
-                "Method call",
-                "Regular (s)",
-                "Decorated (s)",
-                "Decorated ÷ Regular",
-            ],
+            headers=["Method call"]
+            + [f"{column} (s)" for column in implementations]
+            + [f"{column} ÷ Regular" for column in implementations if column != "Regular"],
         )
     )
 
@@ -0,0 +1,230 @@
+import os
+import sys
+import threading
+from time import perf_counter
+from tabulate import tabulate
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_methods import (  # noqa: E402
+    AUDIT,
+    DECISION_CACHE_SIZE,
+    ENFORCED,
+    private,
+    protected,
+    set_mode,
+    set_reporter,
+    set_sample_interval,
+    trusted,
+)
+
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+CALLS_PER_ITERATION = 2
+# Just enough callers to overflow the decision cache
+RACE_GETTERS = DECISION_CACHE_SIZE + 16
+
+
+class RegularClass:
+    def _protected_method(self, value):
+        return value
+
+    def __private_method(self, value):
+        return value
+
+    def work(self, iterations):
+        for i in range(iterations):
+            self._protected_method(i)
+            self.__private_method(i)
+
+
+def create_decorated_class(mode, scoped=False):
+    set_mode(mode)
+    try:
+        class DecoratedClass:
+            @protected
+            def _protected_method(self, value):
+                return value
+
+            @private
+            def __private_method(self, value):
+                return value
+
+            if scoped:
+
+                def work(self, iterations):
+                    with trusted(DecoratedClass) as members:
+                        protected_method = members._protected_method
+                        private_method = members.__private_method
+                        for i in range(iterations):
+                            protected_method(self, i)
+                            private_method(self, i)
+
+            else:
+
+                def work(self, iterations):
+                    for i in range(iterations):
+                        self._protected_method(i)
+                        self.__private_method(i)
+
+        return DecoratedClass
+    finally:
+        set_mode(ENFORCED)
+
+
+def run_threads(target, thread_count):
+    """Runs target(index) in thread_count threads started together, and returns
+    the time until all of them finish."""
+    barrier = threading.Barrier(thread_count + 1)
+
+    def run(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start_time = perf_counter()
+    for thread in threads:
+        thread.join()
+    return perf_counter() - start_time
+
+
+def throughput(cls, thread_count, total_iterations):
+    """Returns the calls per second of thread_count threads sharing the work,
+    each on its own instance of cls."""
+    iterations = total_iterations // thread_count
+    instances = [cls() for _ in range(thread_count)]
+    elapsed = run_threads(lambda index: instances[index].work(iterations), thread_count)
+    return iterations * thread_count * CALLS_PER_ITERATION / elapsed
+
+
+def outside_call(obj):
+    return obj._protected_method()
+
+
+def create_race_class(mode):
+    """Creates a class whose methods are called from more code objects than the
+    decision cache holds, so that threads keep deciding and clearing it."""
+    set_mode(mode)
+    set_sample_interval(1)  # Check every call in audit mode as well
+    try:
+        namespace = {"protected": protected, "private": private}
+        exec(
+            "def __init__(self):\n"
+            "    self.value = 0\n"
+            "@protected\n"
+            "def _protected_method(self):\n"
+            "    return self.value\n"
+            "@private\n"
+            "def _RaceClass__private_method(self):\n"
+            "    return self.value\n",
+            namespace,
+        )
+        for i in range(RACE_GETTERS):
+            exec(
+                f"def get_{i}(self):\n"
+                "    return self._protected_method(), self._RaceClass__private_method()\n",
+                namespace,
+            )
+        del namespace["__builtins__"], namespace["protected"], namespace["private"]
+        return type("RaceClass", (), namespace)
+    finally:
+        set_mode(ENFORCED)
+        set_sample_interval(100)
+
+
+def check_races(mode, thread_count, rounds):
+    """Hammers a class from thread_count threads, checking that allowed calls
+    always return the right values and that calls from outside are always denied
+    (or reported, in audit mode). Returns the number of calls checked."""
+    cls = create_race_class(mode)
+    getters = [getattr(cls, f"get_{i}") for i in range(RACE_GETTERS)]
+    reports = []
+    set_reporter(lambda error, code: reports.append(error))  # list.append is atomic
+    errors = []
+
+    def hammer(index):
+        obj = cls()
+        for round_number in range(rounds):
+            value = index * rounds + round_number
+            obj.value = value
+            # Start at a different getter in every thread, so that they race on
+            # deciding different callers
+            for getter in getters[index:] + getters[:index]:
+                if getter(obj) != (value, value):
+                    errors.append(f"Wrong value in thread {index}")
+            try:
+                outside_call(obj)
+                if mode == ENFORCED:
+                    errors.append(f"Call from outside allowed in thread {index}")
+            except PermissionError:
+                if mode != ENFORCED:
+                    errors.append(f"Call from outside raised in thread {index}")
+
+    try:
+        run_threads(hammer, thread_count)
+    finally:
+        set_reporter(None)
+    if mode == AUDIT and len(reports) != thread_count * rounds:
+        errors.append(f"{len(reports)} of {thread_count * rounds} violations reported in audit mode")
+    if errors:
+        raise AssertionError(f"{len(errors)} races found, e.g. {errors[0]}")
+    return thread_count * rounds * (len(getters) * 2 + 1)
+
+
+def main():
+    total_iterations = 200_000
+    runs = 3
+    race_rounds = 5
+
+    implementations = {
+        "Regular": RegularClass,
+        "Enforced": create_decorated_class(ENFORCED),
+        "Audit": create_decorated_class(AUDIT),
+        "Trusted scope": create_decorated_class(ENFORCED, scoped=True),
+    }
+    set_reporter(lambda error, code: None)  # Only measure the cost of sampling
+
+    results = {count: {column: [] for column in implementations} for count in THREAD_COUNTS}
+    for _ in range(runs):
+        for count in THREAD_COUNTS:
+            for column, cls in implementations.items():
+                results[count][column].append(throughput(cls, count, total_iterations))
+    set_reporter(None)
+
+    table = []
+    for count, rates in results.items():
+        averages = {column: sum(rates[column]) / runs for column in implementations}
+        table.append(
+            [count]
+            + [f"{average / 1e6:.2f}" for average in averages.values()]
+            + [
+                f"{average / averages['Regular']:.2f}"
+                for column, average in averages.items()
+                if column != "Regular"
+            ]
+        )
+
+    gil = "enabled" if getattr(sys, "_is_gil_enabled", lambda: True)() else "disabled"
+    print(
+        f"Throughput (average of {runs} runs, {total_iterations:_} iterations shared by "
+        f"the threads, GIL {gil}):"
+    )
+    print(
+        tabulate(
+            table,
+            headers=["Threads"]
+            + [f"{column} (M calls/s)" for column in implementations]
+            + [f"{column} ÷ Regular" for column in implementations if column != "Regular"],
+        )
+    )
+
+    print()
+    for mode in (ENFORCED, AUDIT):
+        calls = check_races(mode, max(THREAD_COUNTS), race_rounds)
+        print(f"Race check ({mode}): {calls:_} calls from {max(THREAD_COUNTS)} threads, no races")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,192 @@
-import inspect
+import functools
+import sys
+from types import MethodType
+# The configuration is shared with encapsulated_attributes, and set through either module
+from caller_identification import (  # noqa: F401
+    AUDIT,
+    DECISION_CACHE_SIZE,
+    ENFORCED,
+    MODES,
+    PRODUCTION,
+    DecisionCache,
+    caller_instance,
+    counter,
+    get_mode,
+    get_sample_interval,
+    is_defined_in,
+    report_violation,
+    set_mode,
+    set_reporter,
+    set_sample_interval,
+    signature,
+    subclasses,
+    trusted,
+)
 
 
-def protected(func):
-    def wrapper(*args, **kwargs):
-        frame = inspect.currentframe().f_back  # Get the frame info of the caller
-        if "self" in frame.f_locals:
-            defining_class_name = func.__qualname__.split(".")[0]
-            defining_class = getattr(
-                inspect.getmodule(func), defining_class_name, None
-            )
-            # Check if 'self' is an instance of the defining class or its subclasses
-            if defining_class and isinstance(
-                frame.f_locals["self"], defining_class
-            ):
-                return func(*args, **kwargs)
-
-        raise PermissionError(
-            f"Protected function '{func.__name__}' cannot be called outside its defining class and subclasses"
+def _specialized_function(method):
+    """Generates a function with the exact signature of the method's function,
+    which checks its caller and then forwards its arguments without packing them."""
+    func = method.__wrapped__
+    parameters, arguments = signature(func)
+    source = (
+        "def __create_function(__func, __decisions, __allows, __error, __getframe):\n"
+        f"    def __function({parameters}):\n"
+        "        if __decisions[__getframe(1).f_code] or __allows(__getframe(1)):\n"
+        f"            return __func({arguments})\n"
+        "        raise __error()\n"
+        "    return __function\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    specialized = namespace["__create_function"](
+        func, method.decisions, method._allows_instance, method._error, sys._getframe
+    )
+    specialized.__defaults__ = func.__defaults__
+    specialized.__kwdefaults__ = func.__kwdefaults__
+    return functools.update_wrapper(specialized, func)
+
+
+class _EncapsulatedMethod:
+    def __init__(self, func):
+        functools.update_wrapper(self, func)
+        self.defining_class = None  # Bound in __set_name__, or found by _owner()
+        self.decisions = DecisionCache(self._decide)
+        self.specialized = None  # Generated on first lookup
+
+    def __set_name__(self, owner, name):
+        self.defining_class = owner
+
+    def __get__(self, instance, owner=None):
+        # The caller is checked when the method is called rather than looked up, so
+        # that a bound method handed out of the class is still checked
+        if self.specialized is None:
+            self.specialized = _specialized_function(self)
+        if instance is None:
+            return self.specialized
+        return MethodType(self.specialized, instance)
+
+    def __call__(self, *args, **kwargs):
+        if self.decisions[sys._getframe(1).f_code] or self._allows_instance(sys._getframe(1)):
+            return self.__wrapped__(*args, **kwargs)
+
+        raise self._error()
+
+    def trust(self, code):
+        """Allows a caller without resolving it, e.g. once a static check proved it
+        safe. The caller is still looked up at each access, the decision is only
+        made ahead of time and kept when the decision cache is cleared."""
+        self.decisions.trust(code, True)
+
+    def _grant(self, code):
+        # The function itself for trusted(), if the caller may call it
+        return self.__wrapped__ if self.decisions[code] else None
+
+    def _owner(self, frame=None):
+        """Returns the defining class. staticmethod and classmethod stacked over the
+        method hide it from __set_name__, so it is then found once through its
+        qualified name, or else among the classes of the caller's instance."""
+        if self.defining_class is None:
+            owner = sys.modules.get(self.__module__)
+            for name in self.__qualname__.split(".")[:-1]:
+                owner = getattr(owner, name, None)
+            classes = [owner] if isinstance(owner, type) else []
+            if frame is not None:
+                classes.extend(type(caller_instance(frame)).__mro__)
+            for cls in classes:
+                if any(getattr(member, "__func__", None) is self for member in vars(cls).values()):
+                    self.defining_class = cls
+                    self.decisions.clear()  # Callers were denied while it was unknown
+                    break
+        return self.defining_class
+
+
+class ProtectedMethod(_EncapsulatedMethod):
+    def _decide(self, code):
+        # Check if the caller is defined in the defining class or its subclasses
+        owner = self._owner()
+        return owner is not None and is_defined_in(code, subclasses(owner))
+
+    def _allows_instance(self, frame):
+        # Never cached, since it depends on the instance the caller runs on
+        owner = self._owner(frame)
+        return owner is not None and isinstance(caller_instance(frame), owner)
+
+    def _error(self):
+        return PermissionError(
+            f"Protected function '{self.__name__}' cannot be called outside its defining class and subclasses"
         )
 
-    wrapper.__name__ = func.__name__
-    wrapper.__doc__ = func.__doc__
-    return wrapper
 
+class PrivateMethod(_EncapsulatedMethod):
+    def _decide(self, code):
+        # Check if the caller is defined in the defining class itself
+        owner = self._owner()
+        return owner is not None and is_defined_in(code, [owner])
 
-def private(func):
-    def wrapper(*args, **kwargs):
-        frame = inspect.currentframe().f_back  # Get the frame info of the caller
-        if "self" in frame.f_locals:
-            defining_class_name = func.__qualname__.split(".")[0]
-            defining_class = getattr(
-                inspect.getmodule(func), defining_class_name, None
-            )
-            # Check if 'self' is an instance of the defining class
-            if type(frame.f_locals["self"]) == defining_class:
-                return func(*args, **kwargs)
-
-        raise PermissionError(
-            f"Private function '{func.__name__}' cannot be called outside it defining class"
+    def _allows_instance(self, frame):
+        # Never cached, since it depends on the instance the caller runs on
+        owner = self._owner(frame)
+        return owner is not None and type(caller_instance(frame)) is owner
+
+    def _error(self):
+        return PermissionError(
+            f"Private function '{self.__name__}' cannot be called outside it defining class"
         )
 
-    wrapper.__name__ = func.__name__
-    wrapper.__doc__ = func.__doc__
-    return wrapper
+
+class _SampledMethod:
+    """Checks one in every sample_interval lookups through an instance, or calls
+    through the class, and reports violations instead of raising them."""
+
+    def __init__(self, func):
+        super().__init__(func)
+        self.lookups = counter()
+        self.sample_interval = get_sample_interval()
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self  # Sampled when called, like the calls of enforced methods
+        if not next(self.lookups) % self.sample_interval:
+            self._audit(sys._getframe(1))
+        return MethodType(self.__wrapped__, instance)
+
+    def __call__(self, *args, **kwargs):
+        if not next(self.lookups) % self.sample_interval:
+            self._audit(sys._getframe(1))
+        return self.__wrapped__(*args, **kwargs)
+
+    def _audit(self, frame):
+        code = frame.f_code
+        if not self.decisions[code] and not self._allows_instance(frame):
+            report_violation(self._error(), code)
+
+    def _grant(self, code):
+        # Always granted, the violation is reported once for the whole block
+        if not self.decisions[code]:
+            report_violation(self._error(), code)
+        return self.__wrapped__
+
+
+class _SampledProtectedMethod(_SampledMethod, ProtectedMethod):
+    pass
+
+
+class _SampledPrivateMethod(_SampledMethod, PrivateMethod):
+    pass
+
+
+def protected(func):
+    if get_mode() == PRODUCTION:
+        return func
+    elif get_mode() == AUDIT:
+        return _SampledProtectedMethod(func)
+    return ProtectedMethod(func)
+
+
+def private(func):
+    if get_mode() == PRODUCTION:
+        return func
+    elif get_mode() == AUDIT:
+        return _SampledPrivateMethod(func)
+    return PrivateMethod(func)
@@ -1,4 +1,9 @@
-from encapsulated_methods import protected, private
+import os
+import sys
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_methods import protected, private  # noqa: E402
 
 
 class DecoratedClass:
@@ -0,0 +1,137 @@
+import os
+import sys
+from time import perf_counter
+from tabulate import tabulate
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(PACKAGE_DIRECTORY, "caller_identification")]
+from encapsulated_methods import private, protected, trusted  # noqa: E402
+
+
+class RegularClass:
+    def _protected_method(self, value):
+        return value
+
+    def __private_method(self, value):
+        return value
+
+    def call_protected(self, iterations):
+        for i in range(iterations):
+            self._protected_method(i)
+
+    def call_private(self, iterations):
+        for i in range(iterations):
+            self.__private_method(i)
+
+    def call_through_class(self, iterations):
+        cls = type(self)
+        for i in range(iterations):
+            cls._protected_method(self, i)
+
+
+class DecoratedClass:
+    @protected
+    def _protected_method(self, value):
+        return value
+
+    @private
+    def __private_method(self, value):
+        return value
+
+    def call_protected(self, iterations):
+        for i in range(iterations):
+            self._protected_method(i)
+
+    def call_private(self, iterations):
+        for i in range(iterations):
+            self.__private_method(i)
+
+    def call_through_class(self, iterations):
+        cls = type(self)
+        for i in range(iterations):
+            cls._protected_method(self, i)
+
+
+class TrustedClass:
+    @protected
+    def _protected_method(self, value):
+        return value
+
+    @private
+    def __private_method(self, value):
+        return value
+
+    def call_protected(self, iterations):
+        with trusted(TrustedClass) as members:
+            protected_method = members._protected_method
+            for i in range(iterations):
+                protected_method(self, i)
+
+    def call_private(self, iterations):
+        with trusted(TrustedClass) as members:
+            private_method = members.__private_method
+            for i in range(iterations):
+                private_method(self, i)
+
+    def call_through_class(self, iterations):
+        with trusted(type(self)) as members:
+            for i in range(iterations):
+                members._protected_method(self, i)
+
+
+def benchmark(func, iterations):
+    start_time = perf_counter()
+    func(iterations)
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    iterations = 1_000_000
+    runs = 5
+
+    implementations = {
+        "Regular": RegularClass,
+        "Enforced": DecoratedClass,
+        "Trusted scope": TrustedClass,
+    }
+    operations = {
+        "Call protected": lambda obj: obj.call_protected,
+        "Call private": lambda obj: obj.call_private,
+        "Call through the class": lambda obj: obj.call_through_class,
+    }
+
+    results = {name: {column: [] for column in implementations} for name in operations}
+
+    for column, cls in implementations.items():
+        for _ in range(runs):
+            obj = cls()
+            for name, operation in operations.items():
+                results[name][column].append(benchmark(operation(obj), iterations))
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in implementations}
+        table.append(
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{average / averages['Regular']:.2f}"
+                for column, average in averages.items()
+                if column != "Regular"
+            ]
+        )
+
+    print(f"Loop results (average of {runs} runs, {iterations:_} iterations per loop):")
+    print(
+        tabulate(
+            table,
+            headers=["Loop"]
+            + [f"{column} (s)" for column in implementations]
+            + [f"{column} ÷ Regular" for column in implementations if column != "Regular"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
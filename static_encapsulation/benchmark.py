@@ -0,0 +1,164 @@
+import os
+import sys
+import types
+from time import perf_counter
+from tabulate import tabulate
+import static_encapsulation
+from static_encapsulation import analyze_source, check_file, trust_safe_accesses
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [
+    os.path.join(PACKAGE_DIRECTORY, "caller_identification"),
+    os.path.join(PACKAGE_DIRECTORY, "encapsulated_attributes"),
+]
+from encapsulated_attributes import DECISION_CACHE_SIZE  # noqa: E402
+
+MODULES = {
+    "Attributes example": os.path.join(PACKAGE_DIRECTORY, "encapsulated_attributes", "example.py"),
+    "Methods example": os.path.join(PACKAGE_DIRECTORY, "encapsulated_methods", "example.py"),
+    "Methods benchmark": os.path.join(PACKAGE_DIRECTORY, "encapsulated_methods", "benchmark.py"),
+}
+
+# More callers than the decision cache holds, so that it gets cleared
+METHOD_COUNT = DECISION_CACHE_SIZE + 44
+RUNTIME_SOURCE = """
+from encapsulated_attributes import ProtectedAttribute
+
+
+class Base:
+    _value = ProtectedAttribute()
+
+    def __init__(self):
+        self._value = 0
+""" + "".join(
+    f"\n    def get_{i}(self):\n        return self._value\n" for i in range(METHOD_COUNT)
+)
+
+
+def load_runtime_module(trust):
+    """Executes RUNTIME_SOURCE as a fresh module, telling its attribute about the
+    accesses proven safe if trust is set, like the import hook does."""
+    module = types.ModuleType("runtime_module")
+    exec(compile(RUNTIME_SOURCE, "<runtime>", "exec"), vars(module))
+    if trust:
+        trust_safe_accesses(module, analyze_source(RUNTIME_SOURCE, "<runtime>"))
+    return module.Base()
+
+
+def first_accesses(trust):
+    """Returns the time taken by the first access of each method."""
+    instance = load_runtime_module(trust)
+    getters = [getattr(instance, f"get_{i}") for i in range(METHOD_COUNT)]
+    start_time = perf_counter()
+    for getter in getters:
+        getter()
+    return perf_counter() - start_time
+
+
+def second_accesses(trust):
+    """Returns the time taken by the second access of each method, once the first
+    ones overflowed the decision cache."""
+    instance = load_runtime_module(trust)
+    getters = [getattr(instance, f"get_{i}") for i in range(METHOD_COUNT)]
+    for getter in getters:
+        getter()
+    start_time = perf_counter()
+    for getter in getters:
+        getter()
+    return perf_counter() - start_time
+
+
+def repeated_accesses(trust, iterations):
+    getter = load_runtime_module(trust).get_0
+    getter()
+    start_time = perf_counter()
+    for _ in range(iterations):
+        getter()
+    return perf_counter() - start_time
+
+
+def runtime_main(runs):
+    """Shows what trusting the accesses proven safe changes at runtime: it decides
+    their callers ahead of time, for good, so only accesses that would otherwise
+    resolve their caller get cheaper. Every access still looks its caller up in
+    the decision cache, so repeated accesses cost the same."""
+    iterations = 1_000_000
+    rows = {
+        f"First access of {METHOD_COUNT} methods": first_accesses,
+        f"Second access of {METHOD_COUNT} methods": second_accesses,
+        f"{iterations:_} repeated accesses": lambda trust: repeated_accesses(trust, iterations),
+    }
+    table = []
+    for name, measure in rows.items():
+        untrusted = sum(measure(False) for _ in range(runs)) / runs
+        trusted = sum(measure(True) for _ in range(runs)) / runs
+        table.append([name, f"{untrusted:.6f}", f"{trusted:.6f}", f"{untrusted / trusted:.2f}"])
+
+    print(f"Runtime effect of trusting safe accesses (average of {runs} runs):")
+    print(tabulate(table, headers=["Accesses", "Untrusted (s)", "Trusted (s)", "Speedup"]))
+
+
+def analyze(path):
+    with open(path, "rb") as source_file:
+        analyze_source(source_file.read(), path)
+
+
+def check_in_new_process(path):
+    static_encapsulation._analyses.clear()  # Only the cache on disk is left
+    check_file(path)
+
+
+def benchmark(func, iterations):
+    start_time = perf_counter()
+    for _ in range(iterations):
+        func()
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    iterations = 200
+    runs = 5
+    sys.dont_write_bytecode = False  # The on-disk cache lives next to the bytecode
+
+    columns = {
+        "Analysis": analyze,
+        "Cached on disk": check_in_new_process,
+        "Cached in memory": check_file,
+    }
+    results = {name: {column: [] for column in columns} for name in MODULES}
+
+    for _ in range(runs):
+        for name, path in MODULES.items():
+            check_file(path)  # Warm up the caches
+            for column, func in columns.items():
+                results[name][column].append(benchmark(lambda: func(path), iterations))
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in columns}
+        table.append(
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{averages['Analysis'] / average:.2f}"
+                for column, average in averages.items()
+                if column != "Analysis"
+            ]
+        )
+
+    print(f"Benchmark results (average of {runs} runs, {iterations:_} iterations each):")
+    print(
+        tabulate(
+            table,
+            headers=["Module"]
+            + [f"{column} (s)" for column in columns]
+            + [f"Speedup {column.lower()}" for column in columns if column != "Analysis"],
+        )
+    )
+    print()
+    runtime_main(runs)
+
+
+if __name__ == "__main__":
+    main()
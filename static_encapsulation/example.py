@@ -0,0 +1,36 @@
+import os
+import sys
+import warnings
+from static_encapsulation import EncapsulationWarning, check_file, install
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ATTRIBUTES_DIRECTORY = os.path.join(PACKAGE_DIRECTORY, "encapsulated_attributes")
+METHODS_DIRECTORY = os.path.join(PACKAGE_DIRECTORY, "encapsulated_methods")
+
+
+def main():
+    for directory in (ATTRIBUTES_DIRECTORY, METHODS_DIRECTORY):
+        path = os.path.join(directory, "example.py")
+        analysis = check_file(path)
+        print(
+            f"{os.path.relpath(path, PACKAGE_DIRECTORY)}: {len(analysis.violations)} violations, "
+            f"{len(analysis.trusted)} accesses proven safe"
+        )
+        for violation in analysis.violations:
+            print(f"  Line {violation.lineno}: {violation.message}")
+
+    # With the import hook installed, violations are reported as soon as a module is
+    # imported, before any of its code runs
+    sys.path[:0] = [ATTRIBUTES_DIRECTORY]
+    install()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", EncapsulationWarning)
+        import example  # The example of encapsulated_attributes, not this one
+
+    print(f"\nWarnings when importing {os.path.relpath(example.__file__, PACKAGE_DIRECTORY)}:")
+    for warning in caught:
+        print(f"  Line {warning.lineno}: {warning.message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+import ast
+import hashlib
+import importlib.machinery
+import importlib.util
+import json
+import os
+import sys
+import warnings
+from dataclasses import asdict, dataclass, field
+
+# Bump whenever the analysis changes, so that stale cache entries are ignored
+ANALYSIS_VERSION = 2
+
+PROTECTED = "protected"
+PRIVATE = "private"
+
+ATTRIBUTE_FACTORIES = {"ProtectedAttribute": PROTECTED, "PrivateAttribute": PRIVATE}
+METHOD_DECORATORS = {"protected": PROTECTED, "private": PRIVATE}
+ENCAPSULATION_NAMES = (*ATTRIBUTE_FACTORIES, *METHOD_DECORATORS)
+
+class EncapsulationWarning(UserWarning):
+    pass
+
+
+@dataclass(frozen=True)
+class Violation:
+    filename: str
+    lineno: int
+    col_offset: int
+    message: str
+
+
+@dataclass(frozen=True)
+class TrustedAccess:
+    """An access that cannot fail at runtime, identified by the defining class and
+    name of the member and by the name and first line of the calling function."""
+
+    defining_class: str
+    member: str
+    function: str
+    firstlineno: int
+
+
+@dataclass
+class Analysis:
+    violations: list = field(default_factory=list)
+    trusted: list = field(default_factory=list)
+
+
+def _mangle(name, class_name):
+    if name.startswith("__") and not name.endswith("__"):
+        return f"_{class_name.lstrip('_')}{name}"
+    return name
+
+
+def _simple_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _dotted_name(node):
+    """Returns the name a base class is written as, like mod.Base, so that bases
+    from other modules never match the classes of the module by their last name."""
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        value = _dotted_name(node.value)
+        return value and f"{value}.{node.attr}"
+    return None
+
+
+def _firstlineno(node):
+    # Code objects of decorated functions start at their first decorator
+    return min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+
+
+class _ClassInfo:
+    def __init__(self, node):
+        self.name = node.name
+        self.bases = [_dotted_name(base) for base in node.bases]
+        self.encapsulated = {}  # Mangled member name -> PROTECTED or PRIVATE
+        self.plain = set()
+        # Instance attributes are left out, they cannot shadow the descriptors
+        for statement in node.body:
+            self._collect(statement)
+
+    def _collect(self, statement):
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            name = _mangle(statement.name, self.name)
+            for decorator in statement.decorator_list:
+                if _simple_name(decorator) in METHOD_DECORATORS:
+                    self.encapsulated[name] = METHOD_DECORATORS[_simple_name(decorator)]
+                    return
+            self.plain.add(name)
+        elif isinstance(statement, (ast.Assign, ast.AnnAssign)):
+            targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+            value = statement.value
+            for target in targets:
+                if not isinstance(target, ast.Name):
+                    continue
+                name = _mangle(target.id, self.name)
+                if isinstance(value, ast.Call) and _simple_name(value.func) in ATTRIBUTE_FACTORIES:
+                    self.encapsulated[name] = ATTRIBUTE_FACTORIES[_simple_name(value.func)]
+                else:
+                    self.plain.add(name)
+
+
+class _Scope:
+    def __init__(self, kind, name=None, firstlineno=0, types=None):
+        self.kind = kind  # "module", "class", "function" or "comprehension"
+        self.name = name
+        self.firstlineno = firstlineno
+        self.types = types or {}  # Variable name -> class name
+
+
+class _AccessVisitor(ast.NodeVisitor):
+    def __init__(self, filename, classes):
+        self.filename = filename
+        self.classes = classes
+        self.analysis = Analysis()
+        self.scopes = []
+        self.definitions = {}  # Member name -> [(kind, defining class name)]
+        for info in classes.values():
+            for name, kind in info.encapsulated.items():
+                self.definitions.setdefault(name, []).append((kind, info.name))
+
+    def visit_Module(self, node):
+        self.scopes.append(_Scope("module"))
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    def visit_ClassDef(self, node):
+        for expression in node.decorator_list + node.bases + node.keywords:
+            self.visit(expression)
+        self.scopes.append(_Scope("class", node.name))
+        for statement in node.body:
+            self.visit(statement)
+        self.scopes.pop()
+
+    def visit_FunctionDef(self, node):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        types = {}
+        arguments = node.args.posonlyargs + node.args.args
+        is_static = any(_simple_name(d) == "staticmethod" for d in node.decorator_list)
+        if self.scopes[-1].kind == "class" and arguments and not is_static:
+            types[arguments[0].arg] = self.scopes[-1].name  # 'self'
+        self.scopes.append(_Scope("function", node.name, _firstlineno(node), types))
+        for statement in node.body:
+            self.visit(statement)
+        self.scopes.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        self.scopes.append(_Scope("function", "<lambda>", node.lineno))
+        self.visit(node.body)
+        self.scopes.pop()
+
+    def _visit_comprehension(self, node):
+        # Comprehensions have code objects of their own before Python 3.12
+        self.scopes.append(_Scope("comprehension"))
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = (
+        _visit_comprehension
+    )
+
+    def visit_Assign(self, node):
+        self.generic_visit(node)
+        # Track the class of variables assigned an instance of a class of this module
+        value = node.value
+        class_name = None
+        if (
+            isinstance(value, ast.Call)
+            and isinstance(value.func, ast.Name)
+            and value.func.id in self.classes
+        ):
+            class_name = value.func.id
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.scopes[-1].types[target.id] = class_name
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        enclosing_class = next(
+            (scope.name for scope in reversed(self.scopes) if scope.kind == "class"), None
+        )
+        name = _mangle(node.attr, enclosing_class) if enclosing_class else node.attr
+        scope = self.scopes[-1]
+
+        # Every encapsulated member with this name that the caller may access can
+        # be trusted, whichever object the access ends up resolving to
+        if scope.kind == "function" and enclosing_class:
+            for kind, defining_class in self.definitions.get(name, ()):
+                if self._is_allowed(kind, defining_class, enclosing_class):
+                    self.analysis.trusted.append(
+                        TrustedAccess(defining_class, name, scope.name, scope.firstlineno)
+                    )
+
+        # Violations are only reported when the class of the object is known
+        receiver_class = self._receiver_class(node.value)
+        member = receiver_class and self._resolve(receiver_class, name)
+        if not member:
+            return
+        kind, defining_class = member
+        if self._is_allowed(kind, defining_class, enclosing_class):
+            return
+        if (
+            kind == PRIVATE
+            and isinstance(node.ctx, ast.Store)
+            and scope.name == "__init__"
+            and self._is_subclass(enclosing_class, defining_class)
+        ):
+            return  # Ignored at runtime rather than refused
+        outside = "its defining class or subclasses" if kind == PROTECTED else "its defining class"
+        self.analysis.violations.append(
+            Violation(
+                self.filename,
+                node.lineno,
+                node.col_offset,
+                f"{kind.capitalize()} member '{name}' of '{defining_class}' is used outside {outside}",
+            )
+        )
+
+    def _receiver_class(self, node):
+        if not isinstance(node, ast.Name):
+            return None
+        for scope in reversed(self.scopes):
+            if scope.kind != "class" and node.id in scope.types:
+                return scope.types[node.id]  # None once assigned anything else
+        if node.id in self.classes:
+            return node.id  # Accessed through the class itself
+        return None
+
+    def _resolve(self, class_name, name):
+        """Finds the class defining a member, as (kind, class name) when it is
+        encapsulated and None when it is not or cannot be told."""
+        pending = [class_name]
+        while pending:
+            info = self.classes.get(pending.pop(0))
+            if info is None:
+                return None  # Defined elsewhere, so it could define the member too
+            if name in info.encapsulated:
+                return info.encapsulated[name], info.name
+            if name in info.plain:
+                return None
+            pending.extend(info.bases)
+        return None
+
+    def _is_subclass(self, class_name, ancestor):
+        pending = [class_name]
+        while pending:
+            current = pending.pop()
+            if current == ancestor:
+                return True
+            if current in self.classes:
+                pending.extend(self.classes[current].bases)
+        return False
+
+    def _is_allowed(self, kind, defining_class, enclosing_class):
+        if kind == PRIVATE:
+            return enclosing_class == defining_class
+        return self._is_subclass(enclosing_class, defining_class)
+
+
+def analyze_source(source, filename="<unknown>"):
+    """Finds encapsulation violations in a module's source and the accesses that
+    cannot fail at runtime."""
+    tree = ast.parse(source, filename)
+    classes = {
+        node.name: _ClassInfo(node) for node in ast.walk(tree) if isinstance(node, ast.ClassDef)
+    }
+    visitor = _AccessVisitor(filename, classes)
+    visitor.visit(tree)
+    return visitor.analysis
+
+
+_analyses = {}  # Path -> (mtime_ns, size, source hash, analysis)
+
+
+def _cache_path(path):
+    return importlib.util.cache_from_source(path).removesuffix(".pyc") + ".encapsulation.json"
+
+
+def _load_cached(path):
+    try:
+        with open(_cache_path(path)) as cache_file:
+            entry = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if entry.get("version") != ANALYSIS_VERSION:
+        return None
+    analysis = Analysis(
+        [Violation(**violation) for violation in entry["violations"]],
+        [TrustedAccess(**access) for access in entry["trusted"]],
+    )
+    return entry["mtime_ns"], entry["size"], entry["hash"], analysis
+
+
+def _store_cached(path, mtime_ns, size, source_hash, analysis):
+    if sys.dont_write_bytecode:
+        return
+    entry = {
+        "version": ANALYSIS_VERSION,
+        "mtime_ns": mtime_ns,
+        "size": size,
+        "hash": source_hash,
+        **asdict(analysis),
+    }
+    cache_path = _cache_path(path)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as cache_file:
+            json.dump(entry, cache_file)
+    except OSError:
+        pass  # Caching is best effort, like writing bytecode
+
+
+def check_file(path):
+    """Analyzes a source file, reusing the previous analysis while the file's
+    modification time and size, or else its content hash, are unchanged."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _analyses.get(path) or _load_cached(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        _analyses[path] = cached
+        return cached[3]
+
+    with open(path, "rb") as source_file:
+        source = source_file.read()
+    source_hash = hashlib.sha256(source).hexdigest()
+    if cached and cached[2] == source_hash:
+        analysis = cached[3]  # Touched but not changed
+    else:
+        analysis = analyze_source(source, path)
+    _analyses[path] = (stat.st_mtime_ns, stat.st_size, source_hash, analysis)
+    _store_cached(path, stat.st_mtime_ns, stat.st_size, source_hash, analysis)
+    return analysis
+
+
+def report(analysis):
+    for violation in analysis.violations:
+        warnings.warn_explicit(
+            violation.message, EncapsulationWarning, violation.filename, violation.lineno
+        )
+
+
+def _code_objects(function):
+    pending = [function.__code__]
+    while pending:
+        code = pending.pop()
+        yield code
+        pending.extend(const for const in code.co_consts if hasattr(const, "co_code"))
+
+
+def trust_safe_accesses(module, analysis):
+    """Tells the encapsulated members of a freshly executed module which of their
+    callers were proven safe. Their decisions are made ahead of time and kept when
+    a decision cache overflows, so those callers are never resolved at runtime.
+    This does not skip the check itself: every access still looks its caller's code
+    object up in the member's decision cache."""
+    code_objects = {}
+    for value in vars(module).values():
+        if not isinstance(value, type) or value.__module__ != module.__name__:
+            continue
+        for member in vars(value).values():
+            member = getattr(member, "__func__", member)
+            member = getattr(member, "__wrapped__", member)
+            if hasattr(member, "__code__"):
+                for code in _code_objects(member):
+                    code_objects[code.co_name, code.co_firstlineno] = code
+
+    for access in analysis.trusted:
+        defining_class = vars(module).get(access.defining_class)
+        member = vars(defining_class).get(access.member) if isinstance(defining_class, type) else None
+        code = code_objects.get((access.function, access.firstlineno))
+        # Members left undecorated in production mode have nothing to trust
+        if code is not None and hasattr(member, "trust"):
+            member.trust(code)
+
+
+class _CheckingLoader(importlib.machinery.SourceFileLoader):
+    def exec_module(self, module):
+        analysis = None
+        source = self.get_data(self.path)
+        if any(name.encode() in source for name in ENCAPSULATION_NAMES):
+            analysis = check_file(self.path)
+            report(analysis)
+        super().exec_module(module)
+        if analysis is not None:
+            trust_safe_accesses(module, analysis)
+
+
+class _CheckingFinder:
+    @classmethod
+    def find_spec(cls, fullname, path=None, target=None):
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec is not None and isinstance(spec.loader, importlib.machinery.SourceFileLoader):
+            spec.loader = _CheckingLoader(spec.loader.name, spec.loader.path)
+        return spec
+
+
+def install():
+    """Checks every module imported from source from now on, warning about its
+    violations before it runs."""
+    if _CheckingFinder not in sys.meta_path:
+        # Right before the regular path finder, so built-in and frozen modules
+        # keep being found first
+        index = sys.meta_path.index(importlib.machinery.PathFinder)
+        sys.meta_path.insert(index, _CheckingFinder)
+
+
+def uninstall():
+    if _CheckingFinder in sys.meta_path:
+        sys.meta_path.remove(_CheckingFinder)
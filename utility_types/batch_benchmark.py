@@ -0,0 +1,119 @@
+import tracemalloc
+from time import perf_counter
+from dataclasses import dataclass
+from tabulate import tabulate
+from utility_types import Batch, pick
+
+
+@dataclass
+class BaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: bool
+    field5: int
+
+
+# Rows like those of analytics jobs, as compact as instances get
+RowClass = pick("RowClass", BaseClass, ["field1", "field2", "field3", "field4", "field5"], slots=True)
+PickedClass = pick("PickedClass", RowClass, ["field1", "field3"], slots=True)
+
+
+def allocated(create):
+    """Returns the result of create() and the memory it still holds afterwards."""
+    tracemalloc.start()
+    result = create()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def benchmark(func, data):
+    start_time = perf_counter()
+    func(data)
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    count = 1_000_000
+    runs = 5
+
+    names = [f"Name {i % 1000}" for i in range(count)]  # Shared by both, like interned strings
+    instances, instances_size = allocated(
+        lambda: [RowClass(i, names[i], i / 3, i % 2 == 0, i % 100) for i in range(count)]
+    )
+    batch, batch_size = allocated(lambda: Batch.from_instances(RowClass, instances))
+
+    print(f"Memory ({count:_} rows):")
+    print(
+        tabulate(
+            [
+                [
+                    f"{instances_size / 2**20:.1f}",
+                    f"{batch_size / 2**20:.1f}",
+                    f"{batch_size / instances_size:.2f}",
+                ]
+            ],
+            headers=["Instances (MB)", "Batch (MB)", "Batch ÷ Instances"],
+        )
+    )
+
+    benchmarks = {
+        "Pick 2 fields": (
+            PickedClass.from_base_many,
+            lambda batch: batch.pick("PickedClass", ["field1", "field3"]),
+        ),
+        "Sum a float field": (
+            lambda rows: sum(row.field3 for row in rows),
+            lambda batch: sum(batch.columns["field3"]),
+        ),
+        "Count a bool field": (
+            lambda rows: sum(row.field4 for row in rows),
+            lambda batch: sum(batch.columns["field4"]),
+        ),
+    }
+    columns = {"Instances": instances, "Batch": batch}
+
+    results = {name: {column: [] for column in columns} for name in benchmarks}
+    for _ in range(runs):
+        for name, funcs in benchmarks.items():
+            for (column, data), func in zip(columns.items(), funcs):
+                results[name][column].append(benchmark(func, data))
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in columns}
+        table.append(
+            [name]
+            + [f"{count / average / 1e6:.2f}" for average in averages.values()]
+            + [f"{averages['Instances'] / averages['Batch']:.2f}"]
+        )
+
+    print()
+    print(f"Throughput (average of {runs} runs, {count:_} rows):")
+    print(
+        tabulate(
+            table,
+            headers=["Operation"]
+            + [f"{column} (M rows/s)" for column in columns]
+            + ["Batch speedup"],
+        )
+    )
+
+    to_batch = sum(
+        benchmark(lambda rows: Batch.from_instances(RowClass, rows), instances) for _ in range(runs)
+    )
+    to_instances = sum(benchmark(Batch.to_instances, batch) for _ in range(runs))
+    print()
+    print(f"Conversion (average of {runs} runs, {count:_} rows):")
+    print(
+        tabulate(
+            [[f"{count * runs / to_batch / 1e6:.2f}", f"{count * runs / to_instances / 1e6:.2f}"]],
+            headers=["To batch (M rows/s)", "To instances (M rows/s)"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from time import perf_counter
 from dataclasses import dataclass, make_dataclass
 from typing import Optional
 from tabulate import tabulate
-from utility_types import omit, pick, partial, required
+from utility_types import clear_cache, omit, pick, partial, required
 
 
 # Define an arbitrary base class
@@ -75,6 +75,21 @@ def create_required_class_utility():
     return required("RequiredClass", BaseClass)
 
 
+def first_derivation(create, generated_code=True):
+    """Derives a class as if for the first time, with nothing cached in memory,
+    including the code generated for its layout unless generated_code is False.
+    The first derivation of a layout compiles its __init__, __repr__ and __eq__
+    along with the serialization methods, and the update methods of partial
+    types, which is why it costs more than @dataclass. That code is shared by
+    every later class with the same layout."""
+
+    def derive():
+        clear_cache(generated_code)
+        return create()
+
+    return derive
+
+
 def benchmark(func, iterations):
     start_time = perf_counter()
     for _ in range(iterations):
@@ -97,24 +112,35 @@ def main():
         ),
     }
 
-    results = {name: {"Regular": [], "Utility": []} for name in benchmarks}
+    columns = {
+        "Regular": lambda regular_func, utility_func: regular_func,
+        "First derivation": lambda regular_func, utility_func: first_derivation(utility_func),
+        # A new class whose layout was derived before, e.g. the same fields picked
+        # from another base class
+        "Warm layout": lambda regular_func, utility_func: first_derivation(
+            utility_func, generated_code=False
+        ),
+        # Deriving the same class again, like in a request handler
+        "Repeated derivation": lambda regular_func, utility_func: utility_func,
+    }
+
+    results = {name: {column: [] for column in columns} for name in benchmarks}
 
     for _ in range(runs):
-        for name, (regular_func, utility_func) in benchmarks.items():
-            results[name]["Regular"].append(benchmark(regular_func, iterations))
-            results[name]["Utility"].append(benchmark(utility_func, iterations))
+        for name, funcs in benchmarks.items():
+            for column, select in columns.items():
+                results[name][column].append(benchmark(select(*funcs), iterations))
 
     table = []
     for name, times in results.items():
-        avg_regular = sum(times["Regular"]) / runs
-        avg_utility = sum(times["Utility"]) / runs
-        ratio = avg_utility / avg_regular
+        averages = {column: sum(times[column]) / runs for column in columns}
         table.append(
-            [
-                name,
-                f"{avg_regular:.6f}",
-                f"{avg_utility:.6f}",
-                f"{ratio:.2f}",
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{average / averages['Regular']:.2f}"
+                for column, average in averages.items()
+                if column != "Regular"
             ]
         )
 
@@ -122,7 +148,9 @@ def main():
     print(
         tabulate(
             table,
-            headers=["Transformation", "Regular (s)", "Utility (s)", "Utility ÷ Regular"],
+            headers=["Transformation"]
+            + [f"{column} (s)" for column in columns]
+            + [f"{column} ÷ Regular" for column in columns if column != "Regular"],
         )
     )
 
@@ -0,0 +1,108 @@
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+from tabulate import tabulate
+
+FIELD_COUNT = 12
+CHILD_SOURCE = """
+from time import perf_counter
+start_time = perf_counter()
+import {module_name}
+print(perf_counter() - start_time)
+"""
+
+
+def module_source(count):
+    """Returns the source of a module deriving count types from one dataclass, each
+    with a different field layout, so that none of them can share generated code."""
+    subsets = itertools.chain.from_iterable(
+        itertools.combinations(range(1, FIELD_COUNT + 1), size)
+        for size in range(2, FIELD_COUNT + 1)
+    )
+    lines = [
+        "from dataclasses import dataclass",
+        "from utility_types import pick",
+        "",
+        "@dataclass",
+        "class BaseClass:",
+        *(f"    field{i}: int" for i in range(1, FIELD_COUNT + 1)),
+        "",
+    ]
+    lines += [
+        f'Derived{i} = pick("Derived{i}", BaseClass, {tuple(f"field{j}" for j in subset)})'
+        for i, subset in zip(range(count), subsets)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def start_time(directory, module_name, cache_directory):
+    """Returns the time a new process takes to import the module."""
+    environment = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([directory, os.path.dirname(os.path.abspath(__file__))]),
+    )
+    environment.pop("UTILITY_TYPES_CACHE_DIR", None)
+    if cache_directory is not None:
+        environment["UTILITY_TYPES_CACHE_DIR"] = cache_directory
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SOURCE.format(module_name=module_name)],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output)
+
+
+def main():
+    counts = (10, 100, 500)
+    runs = 5
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            with open(os.path.join(directory, f"derived_{count}.py"), "w") as file:
+                file.write(module_source(count))
+
+        columns = ("No cache", "Cold start", "Warm start")
+        results = {count: {column: [] for column in columns} for count in counts}
+        for run in range(runs):
+            for count in counts:
+                module_name = f"derived_{count}"
+                # Every run starts from an empty cache, filled by the cold start
+                cache_directory = os.path.join(directory, f"cache_{count}_{run}")
+                results[count]["No cache"].append(start_time(directory, module_name, None))
+                results[count]["Cold start"].append(
+                    start_time(directory, module_name, cache_directory)
+                )
+                results[count]["Warm start"].append(
+                    start_time(directory, module_name, cache_directory)
+                )
+
+    table = []
+    for count, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in columns}
+        table.append(
+            [count]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{average / averages['No cache']:.2f}"
+                for column, average in averages.items()
+                if column != "No cache"
+            ]
+        )
+
+    print(f"Import time results in a new process (average of {runs} runs):")
+    print(
+        tabulate(
+            table,
+            headers=["Derived types"]
+            + [f"{column} (s)" for column in columns]
+            + [f"{column} ÷ No cache" for column in columns if column != "No cache"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
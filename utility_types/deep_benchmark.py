@@ -0,0 +1,119 @@
+from time import perf_counter
+from dataclasses import dataclass, fields, is_dataclass, make_dataclass
+from typing import Optional
+from tabulate import tabulate
+from utility_types import clear_cache, partial
+
+DEPTHS = (2, 3, 4, 5, 6)
+FIELDS_PER_LEVEL = 3
+
+
+@dataclass
+class Leaf:
+    field1: int
+    field2: str
+
+
+def create_schema(depth):
+    """Creates dataclasses nested depth levels deep, where every level holds the
+    next one in FIELDS_PER_LEVEL fields, so the sub-types are shared."""
+    cls = Leaf
+    for level in range(depth):
+        annotations = [("value", int)] + [
+            (f"child{i}", cls if i % 2 else Optional[cls]) for i in range(FIELDS_PER_LEVEL)
+        ]
+        cls = dataclass(type(f"Level{level}", (), {"__annotations__": dict(annotations)}))
+    return cls
+
+
+def create_deep_partial_naive(cls, counter):
+    """Makes a partial class for every nested dataclass it meets, like a recursive
+    function without memoization would."""
+    counter[0] += 1
+    new_fields = []
+    for base_class_field in fields(cls):
+        field_type = base_class_field.type
+        members = (field_type, *getattr(field_type, "__args__", ()))
+        nested_class = next((member for member in members if is_dataclass(member)), None)
+        if nested_class is not None:
+            field_type = Optional[create_deep_partial_naive(nested_class, counter)]
+        new_fields.append((base_class_field.name, field_type, None))
+    return make_dataclass(f"Partial{cls.__name__}", new_fields)
+
+
+def count_classes(cls, seen):
+    """Counts the distinct dataclasses reachable from cls."""
+    if cls in seen:
+        return 0
+    seen.add(cls)
+    return 1 + sum(
+        count_classes(member, seen)
+        for base_class_field in fields(cls)
+        for member in (base_class_field.type, *getattr(base_class_field.type, "__args__", ()))
+        if is_dataclass(member)
+    )
+
+
+def benchmark(func, iterations):
+    start_time = perf_counter()
+    for _ in range(iterations):
+        func()
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    iterations = 5
+    runs = 3
+
+    table = []
+    for depth in DEPTHS:
+        schema = create_schema(depth)
+        counter = [0]
+        create_deep_partial_naive(schema, counter)
+        naive_classes = counter[0]
+        deep_classes = count_classes(partial("DeepPartial", schema, deep=True), set())
+
+        def derive_deep():
+            clear_cache()
+            partial("DeepPartial", schema, deep=True)
+
+        naive_times = []
+        deep_times = []
+        for _ in range(runs):
+            naive_times.append(benchmark(lambda: create_deep_partial_naive(schema, [0]), iterations))
+            deep_times.append(benchmark(derive_deep, iterations))
+        naive_average = sum(naive_times) / runs / iterations
+        deep_average = sum(deep_times) / runs / iterations
+        table.append(
+            [
+                depth,
+                naive_classes,
+                f"{naive_average:.6f}",
+                deep_classes,
+                f"{deep_average:.6f}",
+                f"{naive_average / deep_average:.2f}",
+            ]
+        )
+
+    print(
+        f"Deep partial of nested dataclasses sharing sub-types, {FIELDS_PER_LEVEL} per level "
+        f"(average of {runs} runs, {iterations} iterations each):"
+    )
+    print(
+        tabulate(
+            table,
+            headers=[
+                "Depth",
+                "Naive classes",
+                "Naive (s)",
+                "Deep classes",
+                "Deep (s)",
+                "Deep speedup",
+            ],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from pprint import pprint
 from datetime import date
-from utility_types import omit, pick, partial, required
+from utility_types import Transform, pick, required
 
 
 @dataclass
@@ -16,13 +16,17 @@ class User:
 
 
 # To display profiles on the UI, only the name and profile picture URL are needed.
-UserPreview = pick("UserPreview", User, ("name", "profile_picture_url"))
+# Previews are created in large numbers, so they keep their fields in slots.
+UserPreview = pick("UserPreview", User, ("name", "profile_picture_url"), slots=True)
 
 # When updating user profiles, any number of fields can change, except for the ID.
-UserUpdate = partial("UserUpdate", omit("", User, ("id")))
+# Both steps make one class, only created when first used, which keeps importing
+# this module fast.
+UserUpdate = Transform(User).omit(("id",)).partial().create("UserUpdate", lazy=True)
 
-# To prevent bots, all fields must be filled out (including the phone number).
-UserComplete = required("UserComplete", User)
+# To prevent bots, all fields must be filled out (including the phone number),
+# which is checked when the form is submitted.
+UserComplete = required("UserComplete", User, validate=True)
 
 
 def main():
@@ -34,7 +38,7 @@ def main():
         "https://example.com/profile_picture.jpg",
         "john.doe@example.com",
     )
-    user_preview = UserPreview(user.name, user.profile_picture_url)
+    user_preview = UserPreview.from_base(user)
     user_update = UserUpdate(
         profile_picture_url="https://example.com/profile_picture.jpg",
         email="john123@example.com",
@@ -52,6 +56,7 @@ def main():
     pprint(user)
     pprint(user_preview)
     pprint(user_update)
+    pprint(user_update.merge(user))
     pprint(user_complete)
 
 
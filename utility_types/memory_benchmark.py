@@ -0,0 +1,82 @@
+import tracemalloc
+from dataclasses import dataclass
+from tabulate import tabulate
+from utility_types import pick
+
+
+@dataclass
+class BaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: bool
+    field5: str
+
+
+@dataclass(slots=True)
+class SlotsBaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: bool
+    field5: str
+
+
+@dataclass
+class PickedClassRegular:
+    field2: str
+    field4: bool
+
+
+@dataclass(slots=True)
+class PickedSlotsClassRegular:
+    field2: str
+    field4: bool
+
+
+def measure(cls, count):
+    """Returns the number of bytes allocated per instance of cls."""
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        instances = [cls("Value", True) for _ in range(count)]
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Leave out the list holding the instances
+    return (end - start - instances.__sizeof__()) / count
+
+
+def main():
+    count = 100_000
+    runs = 5
+
+    implementations = {
+        "Regular": PickedClassRegular,
+        "Regular with slots": PickedSlotsClassRegular,
+        "Utility": pick("PickedClass", BaseClass, ("field2", "field4")),
+        "Utility with slots": pick("PickedClass", BaseClass, ("field2", "field4"), slots=True),
+        "Utility from slotted base": pick("PickedClass", SlotsBaseClass, ("field2", "field4")),
+    }
+
+    results = {name: [] for name in implementations}
+    for _ in range(runs):
+        for name, cls in implementations.items():
+            results[name].append(measure(cls, count))
+
+    table = []
+    averages = {name: sum(sizes) / runs for name, sizes in results.items()}
+    for name, average in averages.items():
+        table.append([name, f"{average:.1f}", f"{average / averages['Regular']:.2f}"])
+
+    print(f"Memory results (average of {runs} runs, {count:_} instances each):")
+    print(
+        tabulate(
+            table,
+            headers=["Storage", "Bytes per instance", "÷ Regular"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
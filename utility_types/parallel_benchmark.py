@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from tabulate import tabulate
+from utility_types import UNSET, partial, pick
+
+
+@dataclass
+class BaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: bool
+    field5: str
+
+
+PickedClass = pick("PickedClass", BaseClass, ("field1", "field2", "field4"))
+# Not importable by its name, which pickling derived classes does not need
+UpdateClass = partial("", BaseClass, default=UNSET)
+
+
+def project(chunk):
+    """Projects a chunk of objects, and applies an update to each projection."""
+    picked = PickedClass.from_base_many(chunk)
+    updates = [UpdateClass(field2=obj.field2.upper()) for obj in picked]
+    return UpdateClass.merge_many(updates, picked)
+
+
+def throughput(workers, chunks):
+    """Returns the number of objects projected per second by a pool of workers,
+    including sending the objects to them and their projections back."""
+    with ProcessPoolExecutor(workers) as pool:
+        list(pool.map(project, chunks[:workers]))  # Start the workers
+        start_time = perf_counter()
+        results = list(pool.map(project, chunks))
+        end_time = perf_counter()
+    return sum(len(result) for result in results) / (end_time - start_time)
+
+
+def main():
+    count = 200_000
+    chunk_size = 5_000
+    runs = 3
+    worker_counts = (1, 2, 4, 8)
+
+    objs = [BaseClass(i, "Name", 1.0, True, "Email") for i in range(count)]
+    chunks = [objs[i : i + chunk_size] for i in range(0, count, chunk_size)]
+
+    results = {workers: [] for workers in worker_counts}
+    for _ in range(runs):
+        for workers in worker_counts:
+            results[workers].append(throughput(workers, chunks))
+
+    table = []
+    averages = {workers: sum(rates) / runs for workers, rates in results.items()}
+    for workers, average in averages.items():
+        table.append([workers, f"{average / 1e3:.1f}", f"{average / averages[1]:.2f}"])
+
+    print(
+        f"Parallel results (average of {runs} runs, {count:_} objects in chunks of "
+        f"{chunk_size:_}, {os.cpu_count()} CPUs):"
+    )
+    print(
+        tabulate(
+            table,
+            headers=["Processes", "Thousand objects/s", "÷ 1 process"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
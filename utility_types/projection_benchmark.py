@@ -0,0 +1,72 @@
+from time import perf_counter
+from dataclasses import dataclass
+from tabulate import tabulate
+from utility_types import pick
+
+FIELDS_TO_PICK = ("field2", "field4", "field5")
+
+
+@dataclass
+class BaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: bool
+    field5: str
+
+
+PickedClass = pick("PickedClass", BaseClass, FIELDS_TO_PICK)
+
+
+def project_manually(objs):
+    return [PickedClass(obj.field2, obj.field4, obj.field5) for obj in objs]
+
+
+def project_with_getattr(objs):
+    return [PickedClass(*[getattr(obj, name) for name in FIELDS_TO_PICK]) for obj in objs]
+
+
+def project_one_by_one(objs):
+    return [PickedClass.from_base(obj) for obj in objs]
+
+
+def benchmark(func, objs):
+    start_time = perf_counter()
+    func(objs)
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    count = 100_000
+    runs = 5
+
+    objs = [BaseClass(i, "Name", 1.0, True, "Email") for i in range(count)]
+    implementations = {
+        "By hand": project_manually,
+        "getattr loop": project_with_getattr,
+        "from_base": project_one_by_one,
+        "from_base_many": PickedClass.from_base_many,
+    }
+
+    results = {name: [] for name in implementations}
+    for _ in range(runs):
+        for name, func in implementations.items():
+            results[name].append(benchmark(func, objs))
+
+    table = []
+    averages = {name: sum(times) / runs for name, times in results.items()}
+    for name, average in averages.items():
+        table.append([name, f"{average:.6f}", f"{average / averages['By hand']:.2f}"])
+
+    print(f"Projection results (average of {runs} runs, {count:_} objects each):")
+    print(
+        tabulate(
+            table,
+            headers=["Projection", "Time (s)", "÷ By hand"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import io
+import json
+from time import perf_counter
+from dataclasses import asdict, astuple, dataclass
+from tabulate import tabulate
+from utility_types import from_json_lines, pick, to_json_lines
+
+
+@dataclass
+class BaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: bool
+    field5: str
+
+
+PickedClass = pick("PickedClass", BaseClass, ["field1", "field2", "field3", "field4"])
+
+
+def to_json_lines_with_asdict(instances):
+    for instance in instances:
+        yield json.dumps(asdict(instance)) + "\n"
+
+
+def from_json_lines_with_kwargs(cls, lines):
+    for line in lines:
+        yield cls(**json.loads(line))
+
+
+def write_lines(lines):
+    file = io.StringIO()
+    file.writelines(lines)
+    return file.getvalue()
+
+
+def benchmark(func, data):
+    start_time = perf_counter()
+    func(data)
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    count = 100_000
+    runs = 5
+
+    instances = [PickedClass(i, "Name", 1.0, True) for i in range(count)]
+    dicts = [instance.to_dict() for instance in instances]
+    tuples = [instance.to_tuple() for instance in instances]
+    lines = write_lines(to_json_lines(instances)).splitlines(keepends=True)
+    benchmarks = {
+        "To dict": (
+            (lambda data: [asdict(instance) for instance in data], instances),
+            (lambda data: [instance.to_dict() for instance in data], instances),
+        ),
+        "To tuple": (
+            (lambda data: [astuple(instance) for instance in data], instances),
+            (lambda data: [instance.to_tuple() for instance in data], instances),
+        ),
+        # A single instance is created by calling the class either way, from_dict()
+        # and from_tuple() being conveniences, so only many at once are compared
+        "From dicts": (
+            (lambda data: [PickedClass(**values) for values in data], dicts),
+            (PickedClass.from_dict_many, dicts),
+        ),
+        "From tuples": (
+            (lambda data: [PickedClass(*values) for values in data], tuples),
+            (PickedClass.from_tuple_many, tuples),
+        ),
+        "Write JSON Lines": (
+            (lambda data: write_lines(to_json_lines_with_asdict(data)), instances),
+            (lambda data: write_lines(to_json_lines(data)), instances),
+        ),
+        "Read JSON Lines": (
+            (lambda data: list(from_json_lines_with_kwargs(PickedClass, data)), lines),
+            (lambda data: list(from_json_lines(PickedClass, data)), lines),
+        ),
+    }
+    columns = ("dataclasses", "Generated")
+
+    results = {name: {column: [] for column in columns} for name in benchmarks}
+    for _ in range(runs):
+        for name, implementations in benchmarks.items():
+            for column, (func, data) in zip(columns, implementations):
+                results[name][column].append(benchmark(func, data))
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in columns}
+        table.append(
+            [name]
+            + [f"{count / average / 1e6:.2f}" for average in averages.values()]
+            + [f"{averages['dataclasses'] / averages['Generated']:.2f}"]
+        )
+
+    print(f"Throughput (average of {runs} runs, {count:_} instances):")
+    print(
+        tabulate(
+            table,
+            headers=["Operation"]
+            + [f"{column} (M instances/s)" for column in columns]
+            + ["Generated speedup"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import importlib
+import os
+import sys
+import tempfile
+from time import perf_counter
+from tabulate import tabulate
+from utility_types import clear_cache
+
+OPERATIONS = (
+    'pick("{name}", BaseClass, ("field1", "field3", "field5"){lazy})',
+    'omit("{name}", BaseClass, ("field2", "field4"){lazy})',
+    'partial("{name}", BaseClass{lazy})',
+    'required("{name}", BaseClass{lazy})',
+)
+
+
+def module_source(count, lazy):
+    """Returns the source of a module deriving count types from one dataclass."""
+    lines = [
+        "from dataclasses import dataclass",
+        "from utility_types import omit, pick, partial, required",
+        "",
+        "@dataclass",
+        "class BaseClass:",
+        *(f"    field{i}: int" for i in range(1, 11)),
+        "",
+    ]
+    lines += [
+        f"Derived{i} = " + OPERATIONS[i % len(OPERATIONS)].format(
+            name=f"Derived{i}", lazy=", lazy=True" if lazy else ""
+        )
+        for i in range(count)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def import_time(module_name):
+    clear_cache()
+    start_time = perf_counter()
+    importlib.import_module(module_name)
+    end_time = perf_counter()
+    del sys.modules[module_name]
+    return end_time - start_time
+
+
+def main():
+    counts = (10, 100, 500)
+    runs = 5
+
+    with tempfile.TemporaryDirectory() as directory:
+        sys.path.insert(0, directory)
+        modules = {}
+        for count in counts:
+            for lazy in (False, True):
+                module_name = f"derived_{count}_{'lazy' if lazy else 'eager'}"
+                with open(os.path.join(directory, f"{module_name}.py"), "w") as file:
+                    file.write(module_source(count, lazy))
+                modules[count, lazy] = module_name
+
+        results = {count: {"Eager": [], "Lazy": []} for count in counts}
+        for _ in range(runs):
+            for count in counts:
+                results[count]["Eager"].append(import_time(modules[count, False]))
+                results[count]["Lazy"].append(import_time(modules[count, True]))
+        sys.path.remove(directory)
+
+    table = []
+    for count, times in results.items():
+        avg_eager = sum(times["Eager"]) / runs
+        avg_lazy = sum(times["Lazy"]) / runs
+        table.append([count, f"{avg_eager:.6f}", f"{avg_lazy:.6f}", f"{avg_lazy / avg_eager:.2f}"])
+
+    print(f"Import time results (average of {runs} runs):")
+    print(
+        tabulate(
+            table,
+            headers=["Derived types", "Eager (s)", "Lazy (s)", "Lazy ÷ Eager"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from time import perf_counter
+from dataclasses import dataclass
+from tabulate import tabulate
+from utility_types import Transform, clear_cache, omit, pick, partial, required
+
+
+@dataclass
+class BaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: bool
+    field5: str
+
+
+def create_update_class_nested():
+    return partial("UpdateClass", omit("", BaseClass, ["field1"]))
+
+
+def create_update_class_transform():
+    return Transform(BaseClass).omit(["field1"]).partial().create("UpdateClass")
+
+
+def create_form_class_nested():
+    return required("FormClass", partial("", pick("", BaseClass, ["field1", "field2", "field3"])))
+
+
+def create_form_class_transform():
+    return (
+        Transform(BaseClass).pick(["field1", "field2", "field3"]).partial().required().create("FormClass")
+    )
+
+
+def create_summary_class_nested():
+    return partial(
+        "SummaryClass",
+        pick("", omit("", required("", BaseClass), ["field5"]), ["field2", "field3", "field4"]),
+    )
+
+
+def create_summary_class_transform():
+    return (
+        Transform(BaseClass)
+        .required()
+        .omit(["field5"])
+        .pick(["field2", "field3", "field4"])
+        .partial()
+        .create("SummaryClass")
+    )
+
+
+def first_derivation(create):
+    """Derives a class as if for the first time, with nothing cached in memory,
+    including the code generated for its layout."""
+
+    def derive():
+        clear_cache()
+        return create()
+
+    return derive
+
+
+def benchmark(func, iterations):
+    start_time = perf_counter()
+    for _ in range(iterations):
+        func()
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    iterations = 5_000
+    runs = 5
+
+    benchmarks = {
+        "Omit, partial": (create_update_class_nested, create_update_class_transform),
+        "Pick, partial, required": (create_form_class_nested, create_form_class_transform),
+        "Required, omit, pick, partial": (
+            create_summary_class_nested,
+            create_summary_class_transform,
+        ),
+    }
+
+    columns = {
+        "Nested": lambda nested_func, transform_func: first_derivation(nested_func),
+        "Transform": lambda nested_func, transform_func: first_derivation(transform_func),
+        # Deriving the same class again, like in a request handler
+        "Nested repeated": lambda nested_func, transform_func: nested_func,
+        "Transform repeated": lambda nested_func, transform_func: transform_func,
+    }
+
+    results = {name: {column: [] for column in columns} for name in benchmarks}
+
+    for _ in range(runs):
+        for name, funcs in benchmarks.items():
+            for column, select in columns.items():
+                results[name][column].append(benchmark(select(*funcs), iterations))
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in columns}
+        table.append(
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{averages['Transform'] / averages['Nested']:.2f}",
+                f"{averages['Transform repeated'] / averages['Nested repeated']:.2f}",
+            ]
+        )
+
+    print(f"Chained derivation (average of {runs} runs, {iterations:_} iterations each):")
+    print(
+        tabulate(
+            table,
+            headers=["Chain"]
+            + [f"{column} (s)" for column in columns]
+            + ["Transform ÷ Nested", "Transform repeated ÷ Nested repeated"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
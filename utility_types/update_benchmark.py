@@ -0,0 +1,110 @@
+from time import perf_counter
+from dataclasses import dataclass, fields, replace
+from tabulate import tabulate
+from utility_types import UNSET, partial
+
+
+@dataclass
+class BaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: bool
+    field5: str
+
+
+UpdateClass = partial("UpdateClass", BaseClass, default=UNSET)
+
+
+def apply_with_fields_loop(updates, targets):
+    for update, target in zip(updates, targets):
+        for update_field in fields(update):
+            value = getattr(update, update_field.name)
+            if value is not UNSET:
+                setattr(target, update_field.name, value)
+
+
+def apply_one_by_one(updates, targets):
+    for update, target in zip(updates, targets):
+        update.apply_to(target)
+
+
+def merge_with_fields_loop(updates, targets):
+    merged = []
+    for update, target in zip(updates, targets):
+        changes = {}
+        for update_field in fields(update):
+            value = getattr(update, update_field.name)
+            if value is not UNSET:
+                changes[update_field.name] = value
+        merged.append(replace(target, **changes))
+    return merged
+
+
+def merge_one_by_one(updates, targets):
+    return [update.merge(target) for update, target in zip(updates, targets)]
+
+
+def benchmark(func, updates, targets):
+    start_time = perf_counter()
+    func(updates, targets)
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    count = 100_000
+    runs = 5
+
+    # Sparse updates, like those sent to an update endpoint
+    updates = [UpdateClass(field2="New", field5=None) for _ in range(count)]
+    targets = [BaseClass(i, "Name", 1.0, True, "Email") for i in range(count)]
+    benchmarks = {
+        "Apply": {
+            "fields() loop": apply_with_fields_loop,
+            "Generated": apply_one_by_one,
+            "Generated batch": UpdateClass.apply_many,
+        },
+        "Merge": {
+            "fields() loop": merge_with_fields_loop,
+            "Generated": merge_one_by_one,
+            "Generated batch": UpdateClass.merge_many,
+        },
+    }
+
+    results = {
+        name: {column: [] for column in implementations}
+        for name, implementations in benchmarks.items()
+    }
+    for _ in range(runs):
+        for name, implementations in benchmarks.items():
+            for column, func in implementations.items():
+                results[name][column].append(benchmark(func, updates, targets))
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(column_times) / runs for column, column_times in times.items()}
+        table.append(
+            [name]
+            + [f"{average:.6f}" for average in averages.values()]
+            + [
+                f"{average / averages['fields() loop']:.2f}"
+                for column, average in averages.items()
+                if column != "fields() loop"
+            ]
+        )
+
+    columns = list(benchmarks["Apply"])
+    print(f"Update results (average of {runs} runs, {count:_} updates each):")
+    print(
+        tabulate(
+            table,
+            headers=["Update"]
+            + [f"{column} (s)" for column in columns]
+            + [f"{column} ÷ fields() loop" for column in columns if column != "fields() loop"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
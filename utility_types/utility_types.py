@@ -1,59 +1,1476 @@
-from dataclasses import field, fields, make_dataclass
+from array import array
+from dataclasses import (
+    MISSING,
+    FrozenInstanceError,
+    field,
+    fields,
+    is_dataclass,
+    make_dataclass,
+    replace,
+)
+import copyreg
+import functools
+import hashlib
+import importlib
 import inspect
+import itertools
+import json
+import marshal
+import operator
+import os
+import pickle
+import reprlib
+import sys
+import types
+import typing
+import weakref
 
 
-def pick(new_class_name, base_class, fields_to_pick):
-    """Creates a new dataclass from a given dataclass with only the specified fields."""
-    new_class_fields = [
-        (base_class_field.name, base_class_field.type)
+class _Unset:
+    """The type of UNSET."""
+
+    def __repr__(self):
+        return "UNSET"
+
+    def __bool__(self):
+        return False
+
+    def __reduce__(self):
+        return "UNSET"
+
+
+# Default for the fields of partial types that tells unset fields apart from
+# fields set to None
+UNSET = _Unset()
+
+_cache_directory = None
+# Field layout -> function creating the methods of dataclasses with that layout
+_method_factories = {}
+# Base class -> {(new class name, fields, default, options): derived class}. Base
+# classes are only referenced weakly, so their derived classes go away with them
+_derived_classes = weakref.WeakKeyDictionary()
+
+
+def pick(
+    new_class_name,
+    base_class,
+    fields_to_pick,
+    *,
+    lazy=False,
+    slots=None,
+    frozen=None,
+    kw_only=None,
+    validate=None,
+    deep=False,
+):
+    """Creates a new dataclass from a given dataclass with only the specified fields.
+    Unless given, slots, frozen, kw_only and validate are the same as in the given
+    dataclass. With deep=True, fields of nested dataclasses can be picked by their
+    dotted path, e.g. address.city."""
+    if deep:
+        return Transform(base_class).pick(fields_to_pick).create(
+            new_class_name,
+            lazy=lazy,
+            slots=slots,
+            frozen=frozen,
+            kw_only=kw_only,
+            validate=validate,
+            deep=True,
+        )
+    if lazy:
+        return _lazy_class(
+            base_class.__module__,
+            pick,
+            new_class_name,
+            base_class,
+            fields_to_pick,
+            slots=slots,
+            frozen=frozen,
+            kw_only=kw_only,
+            validate=validate,
+        )
+    base_class = _resolve(base_class)
+    field_names = tuple(
+        base_class_field.name
         for base_class_field in fields(base_class)
         if base_class_field.name in fields_to_pick
-    ]
-    new_class = make_dataclass(new_class_name, new_class_fields)
-
-    return new_class
+    )
+    options = _options(base_class, slots, frozen, kw_only, validate)
+    # Picked classes leave out the methods of the given dataclass
+    return _derive(new_class_name, base_class, (field_names, MISSING, False, False, ()), options)
 
 
-def omit(new_class_name, base_class, fields_to_omit):
-    """Creates a new dataclass from a given dataclass with certain fields omitted."""
-    new_class_fields = [
-        (base_class_field.name, base_class_field.type)
+def omit(
+    new_class_name,
+    base_class,
+    fields_to_omit,
+    *,
+    lazy=False,
+    slots=None,
+    frozen=None,
+    kw_only=None,
+    validate=None,
+    deep=False,
+):
+    """Creates a new dataclass from a given dataclass with certain fields omitted.
+    Unless given, slots, frozen, kw_only and validate are the same as in the given
+    dataclass. With deep=True, fields of nested dataclasses can be omitted by their
+    dotted path, e.g. address.zip_code."""
+    if deep:
+        return Transform(base_class).omit(fields_to_omit).create(
+            new_class_name,
+            lazy=lazy,
+            slots=slots,
+            frozen=frozen,
+            kw_only=kw_only,
+            validate=validate,
+            deep=True,
+        )
+    if lazy:
+        return _lazy_class(
+            base_class.__module__,
+            omit,
+            new_class_name,
+            base_class,
+            fields_to_omit,
+            slots=slots,
+            frozen=frozen,
+            kw_only=kw_only,
+            validate=validate,
+        )
+    base_class = _resolve(base_class)
+    field_names = tuple(
+        base_class_field.name
         for base_class_field in fields(base_class)
         if base_class_field.name not in fields_to_omit
-    ]
-    new_class = make_dataclass(new_class_name, new_class_fields)
-    _copy_methods(new_class, base_class)
+    )
+    options = _options(base_class, slots, frozen, kw_only, validate)
+    return _derive(new_class_name, base_class, (field_names, MISSING, True, False, ()), options)
 
-    return new_class
 
+def partial(
+    new_class_name,
+    base_class,
+    *,
+    default=None,
+    lazy=False,
+    slots=None,
+    frozen=None,
+    kw_only=None,
+    validate=None,
+    deep=False,
+):
+    """Creates a new dataclass from a given dataclass with all fields optional.
+    Unless given, slots, frozen, kw_only and validate are the same as in the given
+    dataclass.
 
-def partial(new_class_name, base_class):
-    """Creates a new dataclass from a given dataclass with all fields optional."""
-    new_class_fields = [
-        (base_class_field.name, base_class_field.type, field(default=None))
+    Fields left at the default are unset: apply_to() and merge() only copy the
+    other ones to instances of the given dataclass. With default=UNSET, fields
+    can also be set to None. With deep=True, the fields of nested dataclasses are
+    optional too, and updates of them are applied to the nested instances."""
+    if deep:
+        return Transform(base_class).partial(default=default).create(
+            new_class_name,
+            lazy=lazy,
+            slots=slots,
+            frozen=frozen,
+            kw_only=kw_only,
+            validate=validate,
+            deep=True,
+        )
+    if lazy:
+        return _lazy_class(
+            base_class.__module__,
+            partial,
+            new_class_name,
+            base_class,
+            default=default,
+            slots=slots,
+            frozen=frozen,
+            kw_only=kw_only,
+            validate=validate,
+        )
+    base_class = _resolve(base_class)
+    field_names = tuple(base_class_field.name for base_class_field in fields(base_class))
+    options = _options(base_class, slots, frozen, kw_only, validate)
+    return _derive(new_class_name, base_class, (field_names, default, True, False, ()), options)
+
+
+def required(
+    new_class_name,
+    base_class,
+    *,
+    lazy=False,
+    slots=None,
+    frozen=None,
+    kw_only=None,
+    validate=None,
+    deep=False,
+):
+    """Creates a new dataclass from a given dataclass with all fields required, and
+    not None where the given dataclass allows it. Unless given, slots, frozen,
+    kw_only and validate are the same as in the given dataclass. With deep=True,
+    the fields of nested dataclasses are required too."""
+    if deep:
+        return Transform(base_class).required().create(
+            new_class_name,
+            lazy=lazy,
+            slots=slots,
+            frozen=frozen,
+            kw_only=kw_only,
+            validate=validate,
+            deep=True,
+        )
+    if lazy:
+        return _lazy_class(
+            base_class.__module__,
+            required,
+            new_class_name,
+            base_class,
+            slots=slots,
+            frozen=frozen,
+            kw_only=kw_only,
+            validate=validate,
+        )
+    base_class = _resolve(base_class)
+    field_names = tuple(base_class_field.name for base_class_field in fields(base_class))
+    options = _options(base_class, slots, frozen, kw_only, validate)
+    return _derive(new_class_name, base_class, (field_names, MISSING, True, True, ()), options)
+
+
+class Transform:
+    """A chain of pick, omit, partial and required steps from a given dataclass.
+    create() makes the dataclass at the end of the chain at once, without making
+    the ones in between."""
+
+    def __init__(self, base_class, steps=()):
+        self.base_class = base_class
+        self.steps = steps
+
+    def pick(self, fields_to_pick):
+        return Transform(self.base_class, self.steps + (("pick", fields_to_pick),))
+
+    def omit(self, fields_to_omit):
+        return Transform(self.base_class, self.steps + (("omit", fields_to_omit),))
+
+    def partial(self, *, default=None):
+        return Transform(self.base_class, self.steps + (("partial", default),))
+
+    def required(self):
+        return Transform(self.base_class, self.steps + (("required", None),))
+
+    def create(
+        self,
+        new_class_name,
+        *,
+        lazy=False,
+        slots=None,
+        frozen=None,
+        kw_only=None,
+        validate=None,
+        deep=False,
+    ):
+        """Creates the dataclass the steps lead to, with the fields and methods that
+        applying them one by one would give. Unless given, slots, frozen, kw_only
+        and validate are the same as in the given dataclass.
+
+        With deep=True, the steps are also applied to the dataclasses the fields
+        hold, directly or in unions, lists, dicts and other generics, and so on
+        down: pick and omit take the dotted paths of their fields (e.g.
+        address.city), while partial and required apply to all of them. Each is
+        derived once per steps applied to it, named after the new class (e.g.
+        UserUpdate.Address), so recursive and shared dataclasses are handled, and
+        from_base() converts the nested instances too."""
+        if lazy:
+            return _lazy_class(
+                self.base_class.__module__,
+                self.create,
+                new_class_name,
+                slots=slots,
+                frozen=frozen,
+                kw_only=kw_only,
+                validate=validate,
+                deep=deep,
+            )
+        if not self.steps:
+            raise ValueError("Transform has no steps")
+        base_class = _resolve(self.base_class)
+        steps = ()
+        if deep:
+            # Kept with the arguments, to apply them to the nested dataclasses, along
+            # with the top class, which nested classes are derived with
+            steps = tuple(
+                (operation, tuple(argument))
+                if operation in ("pick", "omit") and not isinstance(argument, str)
+                else (operation, argument)
+                for operation, argument in self.steps
+            )
+            steps = (new_class_name, _reference(base_class), steps, steps)
+        options = _options(base_class, slots, frozen, kw_only, validate)
+        arguments = _normalize(base_class, self.steps) + (steps,)
+        return _derive(new_class_name, base_class, arguments, options)
+
+    def __repr__(self):
+        steps = "".join(
+            ".required()"
+            if operation == "required"
+            else f".partial(default={argument!r})"
+            if operation == "partial"
+            else f".{operation}({argument!r})"
+            for operation, argument in self.steps
+        )
+        return f"Transform({self.base_class.__qualname__}){steps}"
+
+
+class Batch:
+    """Instances of a dataclass stored as one column per field, in arrays for int,
+    float and bool fields whose values all have exactly that type and fit, and in
+    lists otherwise. Arrays support the buffer protocol, so e.g. numpy.frombuffer()
+    can use them without copying. Indexing gives row views, and slicing gives a
+    batch with copies of the rows."""
+
+    def __init__(self, row_class, columns, length):
+        self.row_class = row_class
+        self.columns = columns
+        self._length = length
+
+    @classmethod
+    def from_instances(cls, row_class, instances):
+        row_class = _resolve(row_class)
+        instances = instances if isinstance(instances, list) else list(instances)
+        row_class_fields = fields(row_class)
+        columns = {}
+        for row_class_field, field_type in zip(
+            row_class_fields, _resolve_types(row_class, row_class_fields)
+        ):
+            values = list(map(operator.attrgetter(row_class_field.name), instances))
+            columns[row_class_field.name] = _column(values, field_type)
+        return cls(row_class, columns, len(instances))
+
+    def to_instances(self):
+        if not self.columns:  # No fields, which map() needs at least one column for
+            return [self.row_class() for _ in range(self._length)]
+        values = map(_column_values, self.columns.values())
+        if any(row_class_field.kw_only for row_class_field in fields(self.row_class)):
+            names = tuple(self.columns)
+            return [self.row_class(**dict(zip(names, row))) for row in zip(*values)]
+        return list(map(self.row_class, *values))
+
+    def pick(self, new_class_name, fields_to_pick):
+        """Returns a batch of the dataclass pick() derives, sharing the columns."""
+        row_class = pick(new_class_name, self.row_class, fields_to_pick)
+        return self._select(row_class)
+
+    def omit(self, new_class_name, fields_to_omit):
+        """Returns a batch of the dataclass omit() derives, sharing the columns."""
+        row_class = omit(new_class_name, self.row_class, fields_to_omit)
+        return self._select(row_class)
+
+    def _select(self, row_class):
+        columns = {name: self.columns[name] for name in row_class.__dataclass_fields__}
+        return Batch(row_class, columns, self._length)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            columns = {name: column[index] for name, column in self.columns.items()}
+            return Batch(self.row_class, columns, len(range(*index.indices(self._length))))
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("batch index out of range")
+        return _BatchRow(self, index)
+
+    def __iter__(self):
+        return map(_BatchRow, [self] * self._length, range(self._length))
+
+    def __repr__(self):
+        return f"Batch({self.row_class.__qualname__}, {self._length} rows)"
+
+
+class _BatchRow:
+    """A row of a batch, reading its fields from the columns."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    def __getattr__(self, name):
+        try:
+            column = self._batch.columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        value = column[self._index]
+        return bool(value) if _is_bool_column(column) else value
+
+    def to_instance(self):
+        return self._batch[self._index : self._index + 1].to_instances()[0]
+
+    def __repr__(self):
+        fields_repr = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._batch.columns)
+        return f"{self._batch.row_class.__qualname__}({fields_repr})"
+
+
+# Array type codes of the field types kept in arrays
+_TYPECODES = {int: "q", float: "d", bool: "b"}
+
+
+def _column(values, field_type):
+    typecode = _TYPECODES.get(field_type)
+    # Arrays would convert other values silently, e.g. an int in a float field to a
+    # float, a bool in an int field to 1 or an IntEnum to a plain int
+    if typecode is not None and set(map(type, values)) <= {field_type}:
+        try:
+            return array(typecode, values)
+        except OverflowError:  # An int too large
+            pass
+    return values
+
+
+def _is_bool_column(column):
+    # Arrays of signed chars only hold bool fields
+    return isinstance(column, array) and column.typecode == "b"
+
+
+def _column_values(column):
+    return map(bool, column) if _is_bool_column(column) else column
+
+
+def to_json_lines(instances, *, default=None):
+    """Yields each instance of a derived class as a line of JSON, so that any number
+    of them can be written out, e.g. with file.writelines(). default converts values
+    JSON cannot hold, like in json.dumps()."""
+    encode = json.JSONEncoder(separators=(",", ":"), default=default).encode
+    for instance in instances:
+        yield encode(instance.to_dict()) + "\n"
+
+
+def from_json_lines(cls, lines):
+    """Yields an instance of a derived class for each line of JSON, such as the lines
+    of a file, reading only one at a time. Blank lines are skipped."""
+    from_dict = cls.from_dict
+    for line in lines:
+        if line.strip():
+            yield from_dict(json.loads(line))
+
+
+def _normalize(base_class, steps):
+    """Returns the fields, default, whether to copy methods and whether to leave out
+    None that applying the steps to base_class one by one would lead to."""
+    # Every step leaves the fields with the same default, the methods of the given
+    # dataclass are only copied over if no step picks fields, and None is not
+    # allowed anymore after any required step
+    field_names = [base_class_field.name for base_class_field in fields(base_class)]
+    default = MISSING
+    copy_methods = True
+    not_none = False
+    for operation, argument in steps:
+        if operation == "pick":
+            # Dotted paths of deep derivations pick the field holding the nested field
+            field_names = [
+                name
+                for name in field_names
+                if name in argument or any(path.startswith(f"{name}.") for path in argument)
+            ]
+            copy_methods = False
+        elif operation == "omit":
+            field_names = [name for name in field_names if name not in argument]
+        elif operation == "required":
+            not_none = True
+        default = argument if operation == "partial" else MISSING
+    return tuple(field_names), default, copy_methods, not_none
+
+
+def clear_cache(generated_code=True):
+    """Forgets the derived classes and, unless generated_code is False, the code
+    generated for them, so that the next calls create new ones from scratch. The
+    cache directory is left as it is, and so are the dataclass parameters of each
+    combination of options, which never depend on the classes."""
+    _derived_classes.clear()
+    if generated_code:
+        _method_factories.clear()
+
+
+def set_cache_directory(directory):
+    """Sets the directory keeping the compiled code of derived classes, so that later
+    processes load it instead of generating it again. None turns the cache off."""
+    global _cache_directory
+    _cache_directory = directory
+
+
+set_cache_directory(os.environ.get("UTILITY_TYPES_CACHE_DIR", _cache_directory))
+
+
+class _LazyType(type):
+    """The type of the classes standing in for derived classes that are only created
+    the first time they are instantiated or inspected. The derived class is then
+    used through its stand-in: its attributes, docstring, annotations, signature
+    and MRO are looked up, so inspect.signature() and typing.get_type_hints() see
+    the derived class, and isinstance(), issubclass() and subclassing work. The
+    stand-in is still another class: instances are of the derived class, so
+    type(Lazy(...)) is Lazy.__wrapped__ and not Lazy, and inspect.get_annotations()
+    and vars() only see the stand-in's own namespace."""
+
+    def __new__(mcls, name, bases, namespace, **kwargs):
+        # Only reached when subclassing a stand-in, which subclasses its class instead
+        return type(name, tuple(_resolve(base) for base in bases), namespace, **kwargs)
+
+    def __call__(cls, *args, **kwargs):
+        return _resolve(cls)(*args, **kwargs)
+
+    def __getattr__(cls, name):
+        return getattr(_resolve(cls), name)
+
+    def __instancecheck__(cls, instance):
+        return isinstance(instance, _resolve(cls))
+
+    def __subclasscheck__(cls, subclass):
+        return issubclass(subclass, _resolve(cls))
+
+    def __repr__(cls):
+        derived_class = vars(cls).get("__lazy_class__")
+        if derived_class is None:
+            return f"<lazy class '{cls.__qualname__}'>"
+        # Told apart from the derived class, which type() of its instances returns
+        return f"<lazy class '{cls.__qualname__}' for {derived_class!r}>"
+
+    # Data descriptors of type, which __getattr__ is never reached for
+
+    @property
+    def __wrapped__(cls):
+        return _resolve(cls)
+
+    @property
+    def __signature__(cls):
+        return inspect.signature(_resolve(cls))
+
+    @property
+    def __annotations__(cls):
+        return _resolve(cls).__annotations__
+
+    @property
+    def __mro__(cls):
+        return _resolve(cls).__mro__
+
+
+# Set afterwards, since defined in the class body it would replace the docstring
+_LazyType.__doc__ = property(lambda cls: _resolve(cls).__doc__)
+
+copyreg.pickle(_LazyType, lambda cls: _reduce_class(_resolve(cls)))
+
+
+def _lazy_class(module, derive, new_class_name, *args, **options):
+    """Returns a class standing in for derive(new_class_name, *args, **options)."""
+    namespace = {
+        "__module__": module,
+        "__lazy__": (derive, (new_class_name, *args), options),
+        "__lazy_class__": None,
+    }
+    # Created like any class, without going through _LazyType.__new__
+    return type.__new__(_LazyType, new_class_name, (), namespace)
+
+
+def _resolve(cls):
+    """Returns the derived class a lazy class stands for, creating it the first time,
+    or any other class as it is."""
+    if not isinstance(cls, _LazyType):
+        return cls
+    derived_class = vars(cls)["__lazy_class__"]
+    if derived_class is None:
+        derive, arguments, options = vars(cls)["__lazy__"]
+        # Threads racing to create it get the same interned class
+        derived_class = cls.__lazy_class__ = derive(*arguments, **options)
+    return derived_class
+
+
+def _options(base_class, slots, frozen, kw_only, validate):
+    """Fills in the options not given with those of the base class. kw_only stays
+    None then, to keep the keyword-only fields of the base class as they are."""
+    if slots is None:
+        slots = "__slots__" in vars(base_class)
+    if frozen is None:
+        frozen = base_class.__dataclass_params__.frozen
+    if validate is None:
+        validate = _validates(base_class)
+    return slots, frozen, kw_only, validate
+
+
+def _validates(cls):
+    """Returns whether cls is a derived class validating its fields."""
+    derivation = vars(cls).get("__derivation__")
+    return derivation is not None and derivation[3][3]
+
+
+def _is_partial(cls):
+    """Returns whether cls is a partial type, with apply_to() and merge()."""
+    derivation = vars(cls).get("__derivation__")
+    return derivation is not None and derivation[2][1] is not MISSING
+
+
+def _derive(new_class_name, base_class, arguments, options):
+    """Returns the class derived from base_class with the given fields, default,
+    whether to copy its methods, whether to leave out None and the steps to derive
+    nested dataclasses with, if any. Calls with the same arguments return the same
+    class, which is only created the first time."""
+    key = (new_class_name, arguments, options)
+    try:
+        return _derived_classes[base_class][key]
+    except KeyError:
+        pass
+    except TypeError:  # An unhashable default, e.g. a list
+        key = _key(key)
+        if key in _derived_classes.get(base_class, ()):
+            return _derived_classes[base_class][key]
+    if arguments[4]:
+        return _derive_deep(new_class_name, base_class, arguments, options)
+    new_class = _transform(new_class_name, base_class, arguments, options)
+    # Enough to derive the class again in another process, where only the first
+    # class it is derived from needs to be importable
+    new_class.__derivation__ = (new_class_name, _reference(base_class), arguments, options)
+    # Threads racing to derive the same class all get the one stored first
+    return _derived_classes.setdefault(base_class, {}).setdefault(key, new_class)
+
+
+def _derive_deep(new_class_name, base_class, arguments, options):
+    """Derives the classes of a deep derivation: those from the first base class and
+    from every dataclass found in the fields of the derived classes that the steps
+    reach, each once per steps applied to it. Once all are created, the types of
+    their fields are changed to the derived classes, and they are stored together
+    under the first base class, so that they go away with it."""
+    top_class_name, top_reference, top_steps, steps = arguments[4]
+    if new_class_name != top_class_name:  # A nested class, e.g. when unpickled
+        top_base_class = _referenced(top_reference)
+        top_arguments = _normalize(top_base_class, top_steps) + (
+            (top_class_name, top_reference, top_steps, top_steps),
+        )
+        _derive(top_class_name, top_base_class, top_arguments, options)
+        return _derived_classes[top_base_class][_key((new_class_name, arguments, options))]
+    derived = {}  # (Base class, steps) -> (key, derived class)
+    names = set()
+    pending = [(new_class_name, base_class, steps)]
+    while pending:
+        class_name, cls, class_steps = pending.pop(0)
+        if (cls, _key(class_steps)) in derived:
+            continue
+        if class_name in names:  # The same dataclass derived with other steps elsewhere
+            class_name += str(next(n for n in itertools.count(2) if f"{class_name}{n}" not in names))
+        names.add(class_name)
+        class_arguments = _normalize(cls, class_steps) + (
+            (top_class_name, top_reference, top_steps, class_steps),
+        )
+        new_class = _transform(class_name, cls, class_arguments, options)
+        derived[cls, _key(class_steps)] = (class_name, class_arguments, new_class)
+        for new_field in new_class.__dataclass_fields__.values():
+            nested_steps = _nested_steps(class_steps, new_field.name)
+            if nested_steps:
+                pending.extend(
+                    (f"{top_class_name}.{nested_class.__name__}", nested_class, nested_steps)
+                    for nested_class in _dataclasses_in(new_field.type)
+                )
+
+    nested_classes = tuple(new_class for _, _, new_class in derived.values())
+    for (cls, class_steps), (class_name, class_arguments, new_class) in derived.items():
+        new_fields = new_class.__dataclass_fields__
+        converters = {}
+        for new_field in new_fields.values():
+            nested_steps = _nested_steps(class_steps, new_field.name)
+            substitutions = {
+                nested_class: derived[nested_class, _key(nested_steps)][2]
+                for nested_class in _dataclasses_in(new_field.type)
+                if nested_steps
+            }
+            if not substitutions:
+                continue
+            converter = _converter(new_field.type, substitutions)
+            if converter is not None:
+                converters[new_field.name] = converter
+            new_field.type = _substitute(new_field.type, substitutions)
+            new_class.__annotations__[new_field.name] = new_field.type
+        new_class.__doc__ = _signature(new_class.__name__, new_fields)
+        if converters:
+            _add_nested_conversions(new_class, converters)
+        _, default, _, _, _ = class_arguments
+        if default is not MISSING:  # Partial
+            _add_update_methods(new_class, default, nested_classes)
+        if options[3]:
+            _add_validators(new_class)
+        new_class.__derivation__ = (class_name, _reference(cls), class_arguments, options)
+    # Only the classes of the thread storing the top class first are kept, so that
+    # they all refer to each other
+    derived_classes = _derived_classes.setdefault(base_class, {})
+    new_top_class = derived[base_class, _key(steps)][2]
+    top_key = _key((new_class_name, arguments, options))
+    top_class = derived_classes.setdefault(top_key, new_top_class)
+    if top_class is new_top_class:
+        for class_name, class_arguments, new_class in derived.values():
+            derived_classes.setdefault(_key((class_name, class_arguments, options)), new_class)
+    return top_class
+
+
+def _nested_steps(steps, name):
+    """Returns the steps to apply to the dataclasses a field holds: the pick and omit
+    steps naming paths below the field (e.g. city for address.city), unless the
+    field itself is picked whole, and every partial and required step."""
+    prefix = f"{name}."
+    nested_steps = []
+    for operation, argument in steps:
+        if operation in ("pick", "omit"):
+            paths = tuple(path[len(prefix) :] for path in argument if path.startswith(prefix))
+            if paths and not (operation == "pick" and name in argument):
+                nested_steps.append((operation, paths))
+        else:
+            nested_steps.append((operation, argument))
+    return tuple(nested_steps)
+
+
+class _Identity:
+    """Stands in for an unhashable value, like a list default, in the key of a derived
+    class. It is told apart by identity, like the default is in partial types."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return id(self.value)
+
+    def __eq__(self, other):
+        return isinstance(other, _Identity) and other.value is self.value
+
+
+def _key(value):
+    """Returns the value with the unhashable values in it replaced by _Identity."""
+    if isinstance(value, tuple):
+        return tuple(_key(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return _Identity(value)
+    return value
+
+
+def _dataclasses_in(field_type):
+    """Yields the dataclasses in a type, including those in unions and generics."""
+    if isinstance(field_type, type) and is_dataclass(field_type):
+        yield field_type
+    for argument in typing.get_args(field_type):
+        yield from _dataclasses_in(argument)
+
+
+def _substitute(field_type, substitutions):
+    """Returns the type with the dataclasses in it replaced by their substitutes."""
+    if isinstance(field_type, type):
+        return substitutions.get(field_type, field_type)
+    arguments = typing.get_args(field_type)
+    new_arguments = tuple(_substitute(argument, substitutions) for argument in arguments)
+    if all(new is old for new, old in zip(new_arguments, arguments)):
+        return field_type
+    if typing.get_origin(field_type) in (typing.Union, types.UnionType):
+        return typing.Union[new_arguments]
+    if isinstance(field_type, types.GenericAlias):  # e.g. list[int]
+        return types.GenericAlias(typing.get_origin(field_type), new_arguments)
+    return field_type.copy_with(new_arguments)  # e.g. typing.List[int]
+
+
+def _converter(field_type, substitutions):
+    """Returns a function converting a value of the given type, with the instances of
+    the dataclasses in substitutions in it converted by from_base() of their
+    substitutes, or None if the type holds none of them or cannot be rebuilt."""
+    if isinstance(field_type, type):
+        new_class = substitutions.get(field_type)
+        if new_class is None:
+            return None
+        # Looked up at each call, since from_base() of new_class may be replaced later
+        return lambda value: new_class.from_base(value) if isinstance(value, field_type) else value
+    arguments = typing.get_args(field_type)
+    converters = [_converter(argument, substitutions) for argument in arguments]
+    if not any(converters):
+        return None
+    origin = typing.get_origin(field_type)
+    if origin in (typing.Union, types.UnionType):
+        # Each converter leaves values of the other members of the union as they are
+        converters = [converter for converter in converters if converter is not None]
+        return functools.reduce(
+            lambda convert, converter: lambda value: converter(convert(value)), converters
+        )
+    if origin in (list, set, frozenset) or (origin is tuple and arguments[-1] is Ellipsis):
+        convert_item = converters[0]
+        return lambda value: origin(map(convert_item, value)) if isinstance(value, origin) else value
+    if origin is tuple:
+        return lambda value: (
+            tuple(
+                converter(item) if converter is not None else item
+                for converter, item in zip(converters, value)
+            )
+            if isinstance(value, tuple)
+            else value
+        )
+    if origin is dict:
+        convert_key, convert_value = (converter or (lambda item: item) for converter in converters)
+        return lambda value: (
+            {convert_key(key): convert_value(item) for key, item in value.items()}
+            if isinstance(value, dict)
+            else value
+        )
+    return None  # e.g. collections.abc.Sequence, whose instances cannot be rebuilt
+
+
+class _DerivedType(type):
+    """The type of derived classes, which pickle as the way they were derived, since
+    their names often cannot be imported."""
+
+
+def _reduce_class(cls):
+    derivation = vars(cls).get("__derivation__")
+    if derivation is None:  # A subclass, pickled by name like other classes
+        return cls.__qualname__
+    reference = derivation[1]
+    while len(reference) == 4:  # Derived from a derived class
+        reference = reference[1]
+    try:
+        _referenced(reference)
+    except (ImportError, AttributeError):
+        raise pickle.PicklingError(
+            f"Can't pickle {cls!r}: it is derived from '{'.'.join(reference)}', which cannot "
+            "be imported"
+        ) from None
+    return _derived_class, (derivation,)
+
+
+copyreg.pickle(_DerivedType, _reduce_class)
+# Derivations hold MISSING, which would otherwise be unpickled as another object
+copyreg.pickle(type(MISSING), lambda missing: "MISSING")
+
+
+def _derived_class(derivation):
+    """Returns the class with the given __derivation__, deriving it if needed."""
+    new_class_name, base_reference, arguments, options = derivation
+    return _derive(new_class_name, _referenced(base_reference), arguments, options)
+
+
+def _reference(cls):
+    """Returns what finds cls again without holding on to it, since derived classes
+    are stored for as long as the class they are derived from lives: the derivation
+    of a derived class, or else the module and qualified name of the class."""
+    return vars(cls).get("__derivation__") or (cls.__module__, cls.__qualname__)
+
+
+def _referenced(reference):
+    """Returns the class a reference from _reference() stands for."""
+    if len(reference) == 4:
+        return _derived_class(reference)
+    module_name, qualified_name = reference
+    cls = importlib.import_module(module_name)
+    for name in qualified_name.split("."):
+        cls = getattr(cls, name)
+    return cls
+
+
+def _transform(new_class_name, base_class, arguments, options):
+    field_names, default, copy_methods, not_none, steps = arguments
+    base_class_fields = [
+        base_class_field
         for base_class_field in fields(base_class)
+        if base_class_field.name in field_names
+    ]
+    field_types = [base_class_field.type for base_class_field in base_class_fields]
+    if not_none or options[3] or steps:  # Needs the types themselves, not just the annotations
+        field_types = _resolve_types(base_class, base_class_fields)
+    if not_none:
+        field_types = [_without_none(field_type) for field_type in field_types]
+    new_class_fields = [
+        (base_class_field, field_type, default)
+        for base_class_field, field_type in zip(base_class_fields, field_types)
     ]
-    new_class = make_dataclass(new_class_name, new_class_fields)
-    _copy_methods(new_class, base_class)
+    new_class = _create_class(new_class_name, base_class, new_class_fields, options)
+    if copy_methods:
+        _copy_methods(new_class, base_class)
+    if steps:  # The rest depends on the types of the fields, which are changed later
+        return new_class
+    if default is not MISSING:  # Partial
+        _add_update_methods(new_class, default)
+    if options[3]:
+        _add_validators(new_class)
 
     return new_class
 
 
-def required(new_class_name, base_class):
-    """Creates a new dataclass from a given dataclass with all fields required."""
-    new_class_fields = [
-        (base_class_field.name, base_class_field.type, field())
-        for base_class_field in fields(base_class)
+def _resolve_types(base_class, base_class_fields):
+    """Returns the types of the given fields, evaluating string annotations (like
+    those of modules with `from __future__ import annotations`) when possible."""
+    if any(isinstance(base_class_field.type, str) for base_class_field in base_class_fields):
+        try:
+            type_hints = typing.get_type_hints(base_class)
+        except (NameError, SyntaxError, TypeError):  # Left as strings, which are not checked
+            pass
+        else:
+            return [type_hints.get(f.name, f.type) for f in base_class_fields]
+    return [base_class_field.type for base_class_field in base_class_fields]
+
+
+def _without_none(field_type):
+    if typing.get_origin(field_type) in (typing.Union, types.UnionType):
+        members = tuple(member for member in typing.get_args(field_type) if member is not type(None))
+        if members:
+            return typing.Union[members]
+    return field_type
+
+
+def _compile(source):
+    """Compiles generated source, or loads the code compiled from the same source
+    by an earlier process from the cache directory."""
+    if _cache_directory is None or sys.implementation.cache_tag is None:
+        return compile(source, "<string>", "exec")
+    # The source covers everything about the base class that the code depends on,
+    # so changing the base class changes the key and the stale entry is not used
+    key = hashlib.sha256(source.encode()).hexdigest()
+    path = os.path.join(_cache_directory, f"{key}.{sys.implementation.cache_tag}.bin")
+    try:
+        with open(path, "rb") as file:
+            return marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # Missing or unreadable, like an entry from another Python version
+
+    code = compile(source, "<string>", "exec")
+    try:
+        os.makedirs(_cache_directory, exist_ok=True)
+        # Other processes only ever see complete entries
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as file:
+            marshal.dump(code, file)
+        os.replace(temporary_path, path)
+    except OSError:
+        pass
+    return code
+
+
+def _method_factory(layout):
+    """Returns the function creating the methods of dataclasses with the given
+    layout, including the conversions from the base class, dicts and tuples. The
+    layout is whether they are frozen, whether they validate their fields, and the
+    name of every field, whether it has a default and whether it is keyword-only.
+    It is generated once for all classes with the same layout, and takes the class
+    and the default values."""
+    try:
+        return _method_factories[layout]
+    except KeyError:
+        pass
+    frozen, validate, field_layout = layout
+    names = [name for name, _, _ in field_layout]
+    defaults = [f"__default_{i}" for i, (_, has_default, _) in enumerate(field_layout) if has_default]
+    parameters = [
+        f"{name}=__default_{i}" if has_default else name
+        for i, (name, has_default, kw_only) in enumerate(field_layout)
+        if not kw_only
+    ]
+    keyword_parameters = [
+        f"{name}=__default_{i}" if has_default else name
+        for i, (name, has_default, kw_only) in enumerate(field_layout)
+        if kw_only
+    ]
+    if keyword_parameters:
+        parameters += ["*"] + keyword_parameters
+
+    def assignment(name, value):
+        if frozen:
+            return f"        __dataclass_builtins_object__.__setattr__(__dataclass_self__, {name!r}, {value})"
+        return f"        __dataclass_self__.{name} = {value}"
+
+    assignments = [assignment(name, name) for name in names]
+    validation = "        __dataclass_self__.validate()" if validate else "        pass"
+    fields_repr = ", ".join(f"{name}={{self.{name}!r}}" for name in names)
+    self_fields = "".join(f"self.{name}," for name in names)
+    # Every field is read straight from the base class instance in generated code
+    arguments = ", ".join(
+        f"{name}=obj.{name}" if kw_only else f"obj.{name}" for name, _, kw_only in field_layout
+    )
+    # Fields left out of dicts get their default, like in __init__
+    dict_values = [
+        f"data.get({name!r}, __default_{i})" if has_default else f"data[{name!r}]"
+        for i, (name, has_default, _) in enumerate(field_layout)
     ]
-    new_class = make_dataclass(new_class_name, new_class_fields)
-    _copy_methods(new_class, base_class)
+    dict_arguments = ", ".join(
+        f"{name}={value}" if kw_only else value
+        for (name, _, kw_only), value in zip(field_layout, dict_values)
+    )
+    # Unpacked straight into the fields, unless frozen
+    if frozen:
+        tuple_targets = [f"__value_{i}" for i in range(len(names))]
+        tuple_stores = [assignment(name, target) for name, target in zip(names, tuple_targets)]
+    else:
+        tuple_targets = [f"__dataclass_self__.{name}" for name in names]
+        tuple_stores = []
+    # Unpacking is faster than indexing, but keyword-only fields need their names
+    positional_count = sum(not kw_only for _, _, kw_only in field_layout)
+    tuple_arguments = ", ".join(
+        [f"*values[:{positional_count}]" if positional_count < len(field_layout) else "*values"]
+        + [f"{name}=values[{i}]" for i, (name, _, kw_only) in enumerate(field_layout) if kw_only]
+    )
+    lines = [
+        # Named like in dataclasses, which pprint relies on to recognize __repr__
+        f"def __create_fn__({', '.join(['__dataclass_cls__'] + defaults)}):",
+        # Also named like in dataclasses, so that a field called self does not clash
+        f"    def __init__({', '.join(['__dataclass_self__'] + parameters)}):",
+        *assignments,
+        validation,
+        "    def __repr__(self):",
+        f'        return f"{{self.__class__.__qualname__}}({fields_repr})"',
+        "    def __eq__(self, other):",
+        "        if other.__class__ is self.__class__:",
+        f"            return ({self_fields}) == ({''.join(f'other.{name},' for name in names)})",
+        "        return NotImplemented",
+        "    def from_base(cls, obj):",
+        '        """Creates an instance with the fields of an instance of the base class."""',
+        f"        return cls({arguments})",
+        "    def from_base_many(cls, objs):",
+        '        """Creates an instance with the fields of each instance of the base class."""',
+        f"        return [cls({arguments}) for obj in objs]",
+        "    def to_dict(self):",
+        '        """Returns the fields in a dict, without copying their values like asdict()."""',
+        f"        return {{{', '.join(f'{name!r}: self.{name}' for name in names)}}}",
+        "    def to_tuple(self):",
+        '        """Returns the fields in a tuple, without copying their values like astuple()."""',
+        f"        return ({self_fields})",
+        "    def from_dict(cls, data):",
+        '        """Creates an instance from a dict like those of to_dict(), ignoring other keys."""',
+        f"        return cls({dict_arguments})",
+        "    def from_tuple(cls, values):",
+        '        """Creates an instance from a tuple like those of to_tuple()."""',
+        f"        return cls({tuple_arguments})",
+        # Calling the class is as fast as a single instance gets, while many of them
+        # are created in one call without calling __init__ for each. Subclasses may
+        # have an __init__ of their own, so they are still called
+        "    def from_dict_many(cls, data_list):",
+        '        """Creates an instance from each dict like those of to_dict(), ignoring other keys."""',
+        "        if cls is not __dataclass_cls__:",
+        f"            return [cls({dict_arguments}) for data in data_list]",
+        "        __new = __dataclass_builtins_object__.__new__",
+        "        instances = []",
+        "        __append = instances.append",
+        "        for data in data_list:",
+        "            __dataclass_self__ = __new(cls)",
+        *[f"    {assignment(name, value)}" for name, value in zip(names, dict_values)],
+        f"    {validation}",
+        "            __append(__dataclass_self__)",
+        "        return instances",
+        "    def from_tuple_many(cls, values_list):",
+        '        """Creates an instance from each tuple like those of to_tuple()."""',
+        "        if cls is not __dataclass_cls__:",
+        f"            return [cls({tuple_arguments}) for values in values_list]",
+        "        __new = __dataclass_builtins_object__.__new__",
+        "        instances = []",
+        "        __append = instances.append",
+        "        for values in values_list:",
+        "            __dataclass_self__ = __new(cls)",
+        "            try:",
+        f"                ({''.join(f'{target}, ' for target in tuple_targets)}) = values",
+        "            except ValueError:  # Fewer values, the others may have defaults",
+        f"                __append(cls({tuple_arguments}))",
+        "                continue",
+        *[f"    {line}" for line in tuple_stores],
+        f"    {validation}",
+        "            __append(__dataclass_self__)",
+        "        return instances",
+        "    methods = {'__init__': __init__, '__repr__': __repr__, '__eq__': __eq__,",
+        "               'from_base': from_base, 'from_base_many': from_base_many,",
+        "               'to_dict': to_dict, 'to_tuple': to_tuple,",
+        "               'from_dict': from_dict, 'from_tuple': from_tuple,",
+        "               'from_dict_many': from_dict_many, 'from_tuple_many': from_tuple_many}",
+    ]
+    if frozen:
+        lines += [
+            "    def __hash__(self):",
+            f"        return hash(({self_fields}))",
+            "    def __setattr__(self, name, value):",
+            f"        if type(self) is __dataclass_cls__ or name in {tuple(names)!r}:",
+            '            raise FrozenInstanceError(f"cannot assign to field {name!r}")',
+            "        super(__dataclass_cls__, self).__setattr__(name, value)",
+            "    def __delattr__(self, name):",
+            f"        if type(self) is __dataclass_cls__ or name in {tuple(names)!r}:",
+            '            raise FrozenInstanceError(f"cannot delete field {name!r}")',
+            "        super(__dataclass_cls__, self).__delattr__(name)",
+            "    methods.update(__hash__=__hash__, __setattr__=__setattr__, __delattr__=__delattr__)",
+        ]
+    lines.append("    return methods")
+    created = {"__dataclass_builtins_object__": object, "FrozenInstanceError": FrozenInstanceError}
+    exec(_compile("\n".join(lines)), created)
+    return _method_factories.setdefault(layout, created["__create_fn__"])
+
+
+@functools.lru_cache
+def _dataclass_params(slots, frozen, kw_only):
+    """Returns the parameters make_dataclass gives classes with these options."""
+    return make_dataclass("_", [], slots=slots, frozen=frozen, kw_only=kw_only).__dataclass_params__
+
+
+def _create_class(new_class_name, base_class, new_class_fields, options):
+    """Creates a dataclass like make_dataclass would, from a base class field, its
+    type and the new default (or MISSING) for each field, but with generated code
+    shared by all classes with the same layout."""
+    slots, frozen, kw_only, validate = options
+    new_fields = {}
+    for base_class_field, field_type, default in new_class_fields:
+        new_field = field(
+            default=default, kw_only=base_class_field.kw_only if kw_only is None else kw_only
+        )
+        new_field.name = base_class_field.name
+        new_field.type = field_type
+        new_field._field_type = base_class_field._field_type  # Marks a regular field
+        new_fields[new_field.name] = new_field
+    positional_fields = [f for f in new_fields.values() if not f.kw_only]
+
+    namespace = {
+        "__module__": base_class.__module__,
+        "__annotations__": {name: new_field.type for name, new_field in new_fields.items()},
+        "__dataclass_params__": _dataclass_params(slots, frozen, bool(kw_only)),
+        "__dataclass_fields__": new_fields,
+        "__hash__": None,  # Like any dataclass with eq=True and frozen=False
+        "__match_args__": tuple(new_field.name for new_field in positional_fields),
+    }
+    if slots:
+        namespace["__slots__"] = tuple(new_fields)
+    else:  # Slots take the place of the class attributes holding defaults
+        namespace.update(
+            (name, new_field.default)
+            for name, new_field in new_fields.items()
+            if new_field.default is not MISSING
+        )
+    namespace["__doc__"] = _signature(new_class_name, new_fields)
+    new_class = _DerivedType(new_class_name, (), namespace)
+
+    layout = (
+        frozen,
+        validate,
+        tuple((f.name, f.default is not MISSING, f.kw_only) for f in new_fields.values()),
+    )
+    methods = _method_factory(layout)(
+        new_class, *(f.default for f in new_fields.values() if f.default is not MISSING)
+    )
+    __repr__ = methods["__repr__"]
+    methods["__repr__"] = reprlib.recursive_repr()(__repr__)
+    methods["__repr__"].__wrapped__ = __repr__  # Only set by reprlib from Python 3.12, pprint needs it
+    for name, method in methods.items():
+        method.__qualname__ = f"{new_class_name}.{name}"
+        if name.startswith("from_"):
+            method = classmethod(method)
+        setattr(new_class, name, method)
+    if slots and frozen:  # Copying and pickling cannot set the fields otherwise
+        new_class.__getstate__ = _frozen_getstate
+        new_class.__setstate__ = _frozen_setstate
 
     return new_class
 
 
+def _add_update_methods(new_class, default, nested_classes=()):
+    """Adds the methods copying the fields set in an instance of a partial type to
+    instances of its base class, and a to_dict() leaving out unset fields, which
+    from_dict() gives back. They are generated once for all partial types with the
+    same fields, and tell unset fields by identity with the default. Fields set to
+    instances of nested_classes, the other partial types of a deep partial type,
+    are applied to the nested instance of the base class instead."""
+    names = tuple(new_class.__dataclass_fields__)
+    nested_names = tuple(
+        new_field.name
+        for new_field in new_class.__dataclass_fields__.values()
+        if any(
+            member in nested_classes
+            for member in typing.get_args(new_field.type) or (new_field.type,)
+        )
+    )
+    key = ("update", names, nested_names)
+    try:
+        create = _method_factories[key]
+    except KeyError:
+        copy_set_fields = [
+            line
+            for name in names
+            for line in (
+                (
+                    f"        if self.{name} is not __unset:",
+                    f"            if isinstance(self.{name}, __nested):",
+                    f"                self.{name}.apply_to(target.{name})",
+                    "            else:",
+                    f"                target.{name} = self.{name}",
+                )
+                if name in nested_names
+                else (
+                    f"        if self.{name} is not __unset:",
+                    f"            target.{name} = self.{name}",
+                )
+            )
+        ]
+        merge_set_fields = [
+            line
+            for name in names
+            for line in (
+                f"        if self.{name} is not __unset:",
+                f"            changes[{name!r}] = self.{name}.merge(target.{name}) "
+                f"if isinstance(self.{name}, __nested) else self.{name}"
+                if name in nested_names
+                else f"            changes[{name!r}] = self.{name}",
+            )
+        ]
+        collect_set_fields = [
+            line
+            for name in names
+            for line in (
+                f"        if self.{name} is not __unset:",
+                f"            changes[{name!r}] = self.{name}",
+            )
+        ]
+        lines = [
+            "def __create_fn__(__unset, __replace, __nested):",
+            "    def apply_to(self, target):",
+            '        """Sets the fields of target that are set in this update."""',
+            *copy_set_fields,
+            "    def apply_many(cls, updates, targets):",
+            '        """Applies each update to the target at the same position."""',
+            "        for self, target in zip(updates, targets):",
+            *(f"    {line}" for line in copy_set_fields),
+            "    def merge(self, target):",
+            '        """Returns a copy of target with the fields set in this update."""',
+            "        changes = {}",
+            *merge_set_fields,
+            "        return __replace(target, **changes)",
+            "    def merge_many(cls, updates, targets):",
+            '        """Merges each update with the target at the same position."""',
+            "        merged = []",
+            "        for self, target in zip(updates, targets):",
+            "            changes = {}",
+            *(f"    {line}" for line in merge_set_fields),
+            "            merged.append(__replace(target, **changes))",
+            "        return merged",
+            "    def to_dict(self):",
+            '        """Returns the fields set in this update in a dict."""',
+            "        changes = {}",
+            *collect_set_fields,
+            "        return changes",
+            "    return {'apply_to': apply_to, 'apply_many': apply_many,",
+            "            'merge': merge, 'merge_many': merge_many, 'to_dict': to_dict}",
+        ]
+        created = {}
+        exec(_compile("\n".join(lines)), created)
+        create = _method_factories.setdefault(key, created["__create_fn__"])
+
+    for name, method in create(default, replace, nested_classes).items():
+        method.__qualname__ = f"{new_class.__qualname__}.{name}"
+        if name in ("apply_many", "merge_many"):
+            method = classmethod(method)
+        setattr(new_class, name, method)
+
+
+def _add_nested_conversions(new_class, converters):
+    """Replaces from_base() and from_base_many() of a class of a deep derivation with
+    ones also converting the nested instances in the fields with a converter, so
+    that they hold instances of the derived classes too. They are generated once
+    for all classes with the same fields converted."""
+    field_layout = tuple(
+        (new_field.name, new_field.kw_only, new_field.name in converters)
+        for new_field in new_class.__dataclass_fields__.values()
+    )
+    key = ("from_base", field_layout)
+    try:
+        create = _method_factories[key]
+    except KeyError:
+        arguments = ", ".join(
+            ("{}={}" if kw_only else "{1}").format(
+                name, f"__convert_{i}(obj.{name})" if converted else f"obj.{name}"
+            )
+            for i, (name, kw_only, converted) in enumerate(field_layout)
+        )
+        converter_names = [
+            f"__convert_{i}" for i, (_, _, converted) in enumerate(field_layout) if converted
+        ]
+        lines = [
+            f"def __create_fn__({', '.join(converter_names)}):",
+            "    def from_base(cls, obj):",
+            '        """Creates an instance with the fields of an instance of the base class."""',
+            f"        return cls({arguments})",
+            "    def from_base_many(cls, objs):",
+            '        """Creates an instance with the fields of each instance of the base class."""',
+            f"        return [cls({arguments}) for obj in objs]",
+            "    return {'from_base': from_base, 'from_base_many': from_base_many}",
+        ]
+        created = {}
+        exec(_compile("\n".join(lines)), created)
+        create = _method_factories.setdefault(key, created["__create_fn__"])
+
+    methods = create(*(converters[name] for name, _, converted in field_layout if converted))
+    for name, method in methods.items():
+        method.__qualname__ = f"{new_class.__qualname__}.{name}"
+        setattr(new_class, name, classmethod(method))
+
+
+def _frozen_getstate(self):
+    return [getattr(self, name) for name in self.__dataclass_fields__]
+
+
+def _frozen_setstate(self, state):
+    for name, value in zip(self.__dataclass_fields__, state):
+        object.__setattr__(self, name, value)
+
+
+def _signature(new_class_name, new_fields):
+    signature = [_parameter(f) for f in new_fields.values() if not f.kw_only]
+    keyword_parameters = [_parameter(f) for f in new_fields.values() if f.kw_only]
+    if keyword_parameters:
+        signature += ["*"] + keyword_parameters
+    return f"{new_class_name}({', '.join(signature)})"
+
+
+def _parameter(new_field):
+    parameter = f"{new_field.name}: {inspect.formatannotation(new_field.type)}"
+    if new_field.default is not MISSING:
+        parameter += f" = {new_field.default!r}"
+    return parameter
+
+
+# Types that accept others in annotations, like float accepts int
+_ACCEPTED_TYPES = {float: (float, int), complex: (complex, float, int)}
+
+
+def _checked_types(field_type):
+    """Returns the classes an isinstance() check of a field of the given type takes,
+    and whether it can also be None. Only the outer type of generics like list[int]
+    is checked. Returns None if the type cannot be checked, e.g. for Any."""
+    if typing.get_origin(field_type) in (typing.Union, types.UnionType):
+        members = typing.get_args(field_type)
+    else:
+        members = (field_type,)
+    classes = []
+    allows_none = False
+    for member in members:
+        if member is None or member is type(None):
+            allows_none = True
+            continue
+        member = typing.get_origin(member) or member
+        # Any is a class from Python 3.11, but not one isinstance() takes
+        if not isinstance(member, type) or member is typing.Any:  # Or e.g. Literal or strings
+            return None
+        classes.extend(_ACCEPTED_TYPES.get(member, (member,)))
+    return tuple(classes), allows_none
+
+
+def _invalid_field(instance, name):
+    """Returns the error for a field not having the type it is annotated with."""
+    field_type = instance.__dataclass_fields__[name].type
+    value = getattr(instance, name)
+    return TypeError(
+        f"{instance.__class__.__qualname__}.{name} must be {inspect.formatannotation(field_type)}, "
+        f"not {value.__class__.__qualname__}"
+    )
+
+
+def _add_validators(new_class):
+    """Adds validate() and validate_many(), checking the fields against their types
+    with the checks unrolled. They are generated once for all classes whose fields
+    are checked the same way, and take the classes to check against and the
+    defaults, which are valid as well."""
+    checked_fields = []
+    arguments = []
+    for new_field in new_class.__dataclass_fields__.values():
+        checked_types = _checked_types(new_field.type)
+        if checked_types is None:
+            continue
+        classes, allows_none = checked_types
+        has_default = new_field.default is not MISSING
+        checked_fields.append((new_field.name, has_default, allows_none, bool(classes)))
+        arguments += [classes] * bool(classes) + [new_field.default] * has_default
+    key = ("validate", tuple(checked_fields))
+    try:
+        create = _method_factories[key]
+    except KeyError:
+        parameters = []
+        checks = []
+        for i, (name, has_default, allows_none, has_classes) in enumerate(checked_fields):
+            conditions = []
+            if has_classes:
+                parameters.append(f"__classes_{i}")
+                conditions.append(f"isinstance(self.{name}, __classes_{i})")
+            if has_default:
+                parameters.append(f"__default_{i}")
+                conditions.insert(0, f"self.{name} is __default_{i}")
+            if allows_none:
+                conditions.insert(0, f"self.{name} is None")
+            checks += [
+                f"        if not ({' or '.join(conditions)}):",
+                f"            raise __invalid(self, {name!r})",
+            ]
+        lines = [
+            f"def __create_fn__({', '.join(['__invalid'] + parameters)}):",
+            "    def validate(self):",
+            '        """Raises TypeError if a field does not have the type it is annotated with."""',
+            *checks,
+            "        pass",
+            "    def validate_many(cls, instances):",
+            '        """Validates each instance."""',
+            "        for self in instances:",
+            *(f"    {line}" for line in checks),
+            "            pass",
+            "    return {'validate': validate, 'validate_many': validate_many}",
+        ]
+        created = {}
+        exec(_compile("\n".join(lines)), created)
+        create = _method_factories.setdefault(key, created["__create_fn__"])
+
+    for name, method in create(_invalid_field, *arguments).items():
+        method.__qualname__ = f"{new_class.__qualname__}.{name}"
+        if name == "validate_many":
+            method = classmethod(method)
+        setattr(new_class, name, method)
+
+
 def _copy_methods(new_class, base_class):
-    for method_name, value in inspect.getmembers(
-        base_class, predicate=inspect.isroutine
-    ):
-        if method_name not in new_class.__dict__:  # Only copy if not already defined
-            setattr(new_class, method_name, value)
+    # Routines of object are inherited anyway. Copying them would bind the class
+    # methods among them to the base class, and keep it alive
+    names = {name for cls in base_class.__mro__ if cls is not object for name in vars(cls)}
+    if base_class.__dataclass_params__.frozen:
+        # Generated to keep the base class frozen, which is up to the new class
+        names -= {"__setattr__", "__delattr__", "__getstate__", "__setstate__"}
+    if _validates(base_class):  # Generated for the fields of the base class
+        names -= {"validate", "validate_many"}
+    if _is_partial(base_class):  # Also generated, and bound to the base class
+        names -= {"apply_to", "apply_many", "merge", "merge_many"}
+    for method_name in names:
+        # As stored in the class body, since getattr() would bind class methods
+        # to the base class, keeping it alive for as long as the new class lives
+        value = inspect.getattr_static(base_class, method_name)
+        # Only copy if not already defined
+        if method_name in new_class.__dict__:
+            continue
+        if isinstance(value, classmethod):
+            value = classmethod(_rebound(value.__func__, new_class))
+        elif isinstance(value, staticmethod):
+            pass
+        elif inspect.isroutine(value):
+            value = _rebound(value, new_class)
+        else:
+            continue
+        setattr(new_class, method_name, value)
+
+
+def _rebound(function, new_class):
+    """Returns a copy of function whose __class__ cell, used by zero-argument
+    super() and __class__ in the class body, refers to new_class rather than the
+    class it was defined in. Other references to that class, like those held by
+    decorators, are left as they are and keep it alive."""
+    code = getattr(function, "__code__", None)
+    if code is None or "__class__" not in code.co_freevars:
+        return function
+    closure = list(function.__closure__)
+    closure[code.co_freevars.index("__class__")] = types.CellType(new_class)
+    rebound = types.FunctionType(
+        code, function.__globals__, function.__name__, function.__defaults__, tuple(closure)
+    )
+    rebound.__kwdefaults__ = function.__kwdefaults__
+    # Not functools.update_wrapper(), whose __wrapped__ would keep the old cell
+    rebound.__qualname__ = function.__qualname__
+    rebound.__doc__ = function.__doc__
+    rebound.__annotations__ = function.__annotations__
+    rebound.__dict__.update(function.__dict__)
+    return rebound
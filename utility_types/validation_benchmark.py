@@ -0,0 +1,115 @@
+import types
+import typing
+from time import perf_counter
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import Optional
+from tabulate import tabulate
+from utility_types import partial, pick, required
+
+
+@dataclass
+class BaseClass:
+    field1: int
+    field2: str
+    field3: float
+    field4: list[str]
+    field5: date
+    field6: str | None = None
+    field7: Optional[int] = None
+
+
+PickedClass = pick("PickedClass", BaseClass, ["field1", "field2", "field3"], validate=True)
+PartialClass = partial("PartialClass", BaseClass, validate=True)
+RequiredClass = required("RequiredClass", BaseClass, validate=True)
+
+
+def check_type(value, field_type):
+    """Checks a value against a type like the generated validators do, by looking
+    at the type every time."""
+    if typing.get_origin(field_type) in (typing.Union, types.UnionType):
+        return any(check_type(value, member) for member in typing.get_args(field_type))
+    if field_type is type(None):
+        return value is None
+    if field_type is float:
+        return isinstance(value, (float, int))
+    return isinstance(value, typing.get_origin(field_type) or field_type)
+
+
+def validate_reflective(instance):
+    for instance_field in fields(instance):
+        value = getattr(instance, instance_field.name)
+        if value is instance_field.default:
+            continue
+        if not check_type(value, instance_field.type):
+            raise TypeError(f"{instance_field.name} must be {instance_field.type}")
+
+
+def reflective(instances):
+    for instance in instances:
+        validate_reflective(instance)
+
+
+def generated(instances):
+    for instance in instances:
+        instance.validate()
+
+
+def benchmark(func, instances):
+    start_time = perf_counter()
+    func(instances)
+    end_time = perf_counter()
+    return end_time - start_time
+
+
+def main():
+    count = 100_000
+    runs = 5
+
+    today = date.today()
+    benchmarks = {
+        "Pick": (PickedClass, [PickedClass(i, "Name", 1.0) for i in range(count)]),
+        "Partial": (PartialClass, [PartialClass(field2="Name", field6="Phone") for _ in range(count)]),
+        "Required": (
+            RequiredClass,
+            [RequiredClass(i, "Name", 1.0, [], today, "Phone", i) for i in range(count)],
+        ),
+    }
+    columns = {
+        "Reflective": lambda cls: reflective,
+        "Generated": lambda cls: generated,
+        "Generated batch": lambda cls: cls.validate_many,
+    }
+
+    results = {name: {column: [] for column in columns} for name in benchmarks}
+    for _ in range(runs):
+        for name, (cls, instances) in benchmarks.items():
+            for column, select in columns.items():
+                results[name][column].append(benchmark(select(cls), instances))
+
+    table = []
+    for name, times in results.items():
+        averages = {column: sum(times[column]) / runs for column in columns}
+        table.append(
+            [name]
+            + [f"{count / average / 1e6:.2f}" for average in averages.values()]
+            + [
+                f"{averages['Reflective'] / average:.2f}"
+                for column, average in averages.items()
+                if column != "Reflective"
+            ]
+        )
+
+    print(f"Validation throughput (average of {runs} runs, {count:_} instances):")
+    print(
+        tabulate(
+            table,
+            headers=["Type"]
+            + [f"{column} (M instances/s)" for column in columns]
+            + [f"{column} speedup" for column in columns if column != "Reflective"],
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()